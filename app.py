@@ -18,6 +18,8 @@ st.set_page_config(
 @st.cache_data
 def load_data():
     df = pd.read_csv("data/processed/final_anomaly_results.csv")
+    if "recycled_anomaly" not in df.columns:   # results from before the recycled signal
+        df["recycled_anomaly"] = "Normal"
     umap_df = pd.read_csv("data/processed/umap_embeddings.csv")
     topic_kw = pd.read_csv("data/processed/topic_keywords.csv")
     brand_df = pd.read_csv("data/processed/brand_risk_scores.csv")
@@ -100,7 +102,7 @@ logic_table = pd.DataFrame({
         "Brand Risk Intelligence"
     ],
     "Primary Signals Used": [
-        "Linguistic, Location, Temporal anomalies + semantic clustering",
+        "Linguistic, Location, Temporal, Recycled-narrative anomalies + semantic clustering",
         "Topic dominance, sentiment trends, time-series patterns",
         "Total anomaly score, risk label, contextual signals",
         "Composite risk score, frequency of exposure, topic context"
@@ -318,6 +320,7 @@ with tab3:
     "sentiment_label",
     "is_anomaly",
     "temporal_anomaly",
+    "recycled_anomaly",
     "final_label",
     "total_anomaly_score"
     ]].sort_values("total_anomaly_score", ascending=False)
@@ -326,6 +329,7 @@ with tab3:
     review_df = review_df.rename(columns={
     "is_anomaly": "Linguistic Anomaly",
     "temporal_anomaly": "Temporal Anomaly",
+    "recycled_anomaly": "Recycled Narrative",
     "final_label": "Final Risk Label",
     "total_anomaly_score": "Total Anomaly Score"
     })
@@ -0,0 +1,141 @@
+"""
+benchmark_ann_index.py
+----------------------
+Purpose:
+Recall@k and query latency of the HNSW index (ann_index.py)
+versus exact brute-force cosine search, for a few ef settings.
+
+Input:
+embedding store (data/processed/embeddings.npy)
+
+Output:
+data/evaluation/ann_index_benchmark.csv
+"""
+
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from src.features.ann_index import ArticleIndex
+from src.features.embedding_store import load_embeddings
+
+OUTPUT_DIR = "data/evaluation"
+OUTPUT_FILE = f"{OUTPUT_DIR}/ann_index_benchmark.csv"
+
+N_QUERIES = 1000
+K = 10
+EF_VALUES = [16, 32, 64, 128]
+SEED = 42
+
+
+def exact_top_k(matrix, queries, k, chunk_size=10_000):
+    """
+    Brute-force cosine top-k (row positions), one corpus chunk
+    at a time so memory stays bounded.
+    """
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    best_rows = np.zeros((len(queries), k), dtype=np.int64)
+
+    for start in range(0, len(matrix), chunk_size):
+        chunk = np.asarray(matrix[start:start + chunk_size], dtype=np.float32)
+        chunk = chunk / np.linalg.norm(chunk, axis=1, keepdims=True)
+        scores = queries @ chunk.T
+
+        all_scores = np.hstack([best_scores, scores])
+        chunk_rows = np.broadcast_to(np.arange(start, start + len(chunk)), scores.shape)
+        all_rows = np.hstack([best_rows, chunk_rows])
+        top = np.argpartition(-all_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(all_scores, top, axis=1)
+        best_rows = np.take_along_axis(all_rows, top, axis=1)
+
+    return best_rows
+
+
+def check_removals(article_ids, vectors, k=K):
+    """
+    Regression check: queries must still work (and never return
+    removed articles) once most of the index is marked deleted.
+    """
+    n = min(len(article_ids), 50)
+    ann = ArticleIndex(vectors.shape[1], max_elements=n)
+    ann.add(article_ids[:n], vectors[:n])
+
+    removed = article_ids[:n - 5]
+    ann.remove(removed)
+
+    found, _ = ann.query(vectors[:2], k=k)
+    if len(ann) != n - len(removed) or set(found.ravel()) & set(removed):
+        raise AssertionError("ANN index returned removed articles")
+    print(f"  ✔ Query after removing {len(removed)} of {n} articles: ok")
+
+
+def main(n_queries=N_QUERIES, k=K, ef_values=EF_VALUES):
+    print(f"⏱️ Benchmarking ANN index (recall@{k}, latency)...")
+
+    index, matrix = load_embeddings()
+    article_ids = index["article_id"].to_numpy()
+    vectors = np.asarray(matrix, dtype=np.float32)
+
+    start = time.perf_counter()
+    ann = ArticleIndex(vectors.shape[1], max_elements=len(vectors))
+    ann.add(article_ids, vectors)
+    build_seconds = time.perf_counter() - start
+    print(f"✔ Built index over {len(vectors)} articles in {build_seconds:.1f}s")
+
+    check_removals(article_ids, vectors, k)
+
+    rng = np.random.default_rng(SEED)
+    sample = rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False)
+    queries = vectors[sample]
+
+    start = time.perf_counter()
+    exact = article_ids[exact_top_k(matrix, queries, k)]
+    exact_seconds = time.perf_counter() - start
+
+    rows = [{
+        "method": "exact", "ef": None, "recall_at_k": 1.0,
+        "batch_ms_per_query": 1000 * exact_seconds / len(queries),
+        "p50_ms": None, "p95_ms": None,
+    }]
+
+    for ef in ef_values:
+        ann.ef_search = ef
+
+        start = time.perf_counter()
+        found, _ = ann.query(queries, k=k)
+        batch_seconds = time.perf_counter() - start
+
+        # Single-query latency (dashboard-style lookups)
+        latencies = []
+        for q in queries:
+            t = time.perf_counter()
+            ann.query(q[None, :], k=k)
+            latencies.append(time.perf_counter() - t)
+
+        recall = np.mean([
+            len(set(f) & set(e)) / k for f, e in zip(found, exact)
+        ])
+        rows.append({
+            "method": "hnsw", "ef": ef, "recall_at_k": recall,
+            "batch_ms_per_query": 1000 * batch_seconds / len(queries),
+            "p50_ms": 1000 * np.percentile(latencies, 50),
+            "p95_ms": 1000 * np.percentile(latencies, 95),
+        })
+        print(f"  ✔ ef={ef}: recall@{k}={recall:.3f}")
+
+    results = pd.DataFrame(rows)
+    results["k"] = k
+    results["articles"] = len(vectors)
+    results["build_seconds"] = build_seconds
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    results.to_csv(OUTPUT_FILE, index=False)
+
+    print(results)
+    print(f"✅ Benchmark saved to: {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+benchmark_dict_encoding.py
+--------------------------
+Purpose:
+Microbenchmark of per-row transforms (Series.apply / Series.map /
+row-wise apply) versus the dict-encoded helpers in
+src/features/dict_encoding.py, at 1M rows.
+
+Values are drawn from small vocabularies, like real location
+names and anomaly labels. Every pair of results is checked for
+equality before timings are reported.
+
+Output:
+data/evaluation/dict_encoding_benchmark.csv
+"""
+
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from src.features.dict_encoding import map_unique, map_unique_frame, map_unique_rows
+from src.features.location_cleaning import clean_location
+from src.features.location_extraction import detect_location_anomaly, normalize_location
+
+OUTPUT_DIR = "data/evaluation"
+OUTPUT_FILE = f"{OUTPUT_DIR}/dict_encoding_benchmark.csv"
+
+N_ROWS = 1_000_000
+SEED = 42
+
+LOCATIONS = [
+    "Karachi", "Lahore", "karachi", "US", "U.K.", "uae", "Asia", "Middle East",
+    "London", "New York", "strong Dubai", "Khan", "Manchester City", "Unknown",
+    "Islamabad", "Peshawar", "Delhi", "Beijing", "Europe", "Africa", None,
+]
+LABELS = ["Anomaly", "Normal", "Review"]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(n_rows=N_ROWS):
+    print(f"⏱️ Benchmarking dict-encoded transforms at {n_rows:,} rows...")
+
+    rng = np.random.default_rng(SEED)
+    df = pd.DataFrame({
+        "claimed_location": rng.choice(np.array(LOCATIONS, dtype=object), n_rows),
+        "content_location": rng.choice(np.array(LOCATIONS, dtype=object), n_rows),
+        "location_anomaly": rng.choice(LABELS, n_rows),
+    })
+    flag_map = {"Anomaly": 1, "Review": 0.5, "Normal": 0}
+
+    cases = {
+        "normalize_location": (
+            lambda: df["content_location"].apply(normalize_location),
+            lambda: map_unique(df["content_location"], normalize_location),
+        ),
+        "clean_location": (
+            lambda: df["content_location"].apply(lambda x: pd.Series(clean_location(x))),
+            lambda: map_unique_frame(df["content_location"], clean_location, [0, 1]),
+        ),
+        "anomaly_flag_map": (
+            lambda: df["location_anomaly"].map(flag_map),
+            lambda: map_unique(df["location_anomaly"], flag_map.get),
+        ),
+        "detect_location_anomaly": (
+            lambda: df.apply(
+                lambda x: detect_location_anomaly(
+                    x["claimed_location"], x["content_location"]
+                ),
+                axis=1
+            ),
+            lambda: map_unique_rows(
+                df[["claimed_location", "content_location"]],
+                detect_location_anomaly
+            ),
+        ),
+    }
+
+    rows = []
+    for name, (per_row, encoded) in cases.items():
+        expected, per_row_seconds = timed(per_row)
+        result, encoded_seconds = timed(encoded)
+
+        if not expected.equals(result):
+            raise ValueError(f"❌ {name}: dict-encoded result differs")
+
+        rows.append({
+            "transform": name,
+            "rows": n_rows,
+            "per_row_seconds": per_row_seconds,
+            "encoded_seconds": encoded_seconds,
+            "speedup": per_row_seconds / encoded_seconds,
+        })
+        print(f"  ✔ {name}: {per_row_seconds / encoded_seconds:.1f}x")
+
+    results = pd.DataFrame(rows)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    results.to_csv(OUTPUT_FILE, index=False)
+
+    print(results)
+    print(f"✅ Benchmark saved to: {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
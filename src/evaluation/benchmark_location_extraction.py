@@ -0,0 +1,87 @@
+"""
+benchmark_location_extraction.py
+--------------------------------
+Purpose:
+Compare the original per-row location extraction
+(full en_core_web_sm pipeline, one nlp() call per text)
+with the batched nlp.pipe path on the NER-only pipeline.
+
+Reports docs/sec for both and how often they agree.
+
+Input:
+data/processed/news_cleaned.csv
+
+Output:
+data/evaluation/location_extraction_benchmark.csv
+"""
+
+import os
+import time
+import pandas as pd
+
+from src.features.location_extraction import (
+    BATCH_SIZE,
+    N_PROCESS,
+    extract_locations,
+    first_location,
+)
+from src.features.resources import SPACY_MODEL, get_spacy
+
+OUTPUT_DIR = "data/evaluation"
+OUTPUT_FILE = f"{OUTPUT_DIR}/location_extraction_benchmark.csv"
+
+# Articles sampled for the benchmark (Heading + clean_text each)
+SAMPLE_SIZE = 2000
+
+
+def per_row_locations(nlp, texts):
+    """
+    The original path: one full-pipeline nlp() call per text.
+    """
+    results = []
+    for text in texts:
+        if not isinstance(text, str) or text.strip() == "":
+            results.append("Unknown")
+        else:
+            results.append(first_location(nlp(text), text))
+    return results
+
+
+def main(sample_size=SAMPLE_SIZE, batch_size=BATCH_SIZE, n_process=N_PROCESS):
+    print("⏱️ Benchmarking location extraction (per-row vs nlp.pipe)...")
+
+    df = pd.read_csv("data/processed/news_cleaned.csv")
+    df = df.head(sample_size)
+    texts = df["Heading"].tolist() + df["clean_text"].tolist()
+
+    full_nlp = get_spacy(SPACY_MODEL)
+
+    start = time.perf_counter()
+    per_row = per_row_locations(full_nlp, texts)
+    per_row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = extract_locations(texts, batch_size=batch_size, n_process=n_process)
+    batched_seconds = time.perf_counter() - start
+
+    agreement = sum(a == b for a, b in zip(per_row, batched)) / len(texts)
+
+    results = pd.DataFrame({
+        "path": ["per_row_full_pipeline", "nlp_pipe_ner_only"],
+        "docs": [len(texts), len(texts)],
+        "seconds": [per_row_seconds, batched_seconds],
+    })
+    results["docs_per_sec"] = results["docs"] / results["seconds"]
+    results["speedup"] = per_row_seconds / results["seconds"]
+    results["agreement"] = [1.0, agreement]
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    results.to_csv(OUTPUT_FILE, index=False)
+
+    print(f"✔ batch_size={batch_size}, n_process={n_process}")
+    print(results)
+    print(f"✅ Benchmark saved to: {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+benchmark_ner_latency.py
+------------------------
+Purpose:
+Per-article NER latency distribution (p50 / p95 / p99) before
+and after long-article windowing.
+
+before → one nlp() call over the whole Heading + Article
+after  → windowed parse (entity_extraction.pipe_windows)
+
+Input:
+data/processed/news_cleaned.csv
+
+Output:
+data/evaluation/ner_latency_benchmark.csv
+"""
+
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from src.features.entity_extraction import (
+    CHUNK_CHARS,
+    CHUNK_OVERLAP,
+    MAX_ARTICLE_CHARS,
+    get_nlp,
+    pipe_windows,
+)
+
+OUTPUT_DIR = "data/evaluation"
+OUTPUT_FILE = f"{OUTPUT_DIR}/ner_latency_benchmark.csv"
+
+SAMPLE_SIZE = 1000
+
+
+def time_per_article(parse_fn, texts):
+    latencies = []
+    failures = 0
+    for text in texts:
+        start = time.perf_counter()
+        try:
+            parse_fn(text)
+        except ValueError:
+            # spaCy raises ValueError (E088) above nlp.max_length
+            failures += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies), failures
+
+
+def main(sample_size=SAMPLE_SIZE, chunk_chars=CHUNK_CHARS,
+         overlap=CHUNK_OVERLAP, max_chars=MAX_ARTICLE_CHARS):
+    print("⏱️ Benchmarking per-article NER latency (whole text vs windows)...")
+
+    df = pd.read_csv("data/processed/news_cleaned.csv").head(sample_size)
+    texts = [
+        f"{h} {a}" for h, a in zip(df["Heading"].fillna(""), df["Article"].fillna(""))
+    ]
+
+    def windowed(text):
+        return list(pipe_windows(
+            [text], chunk_chars=chunk_chars, overlap=overlap, max_chars=max_chars
+        ))
+
+    runs = {
+        "whole_text": time_per_article(get_nlp(), texts),
+        "windowed": time_per_article(windowed, texts),
+    }
+
+    rows = []
+    for name, (latencies, failures) in runs.items():
+        rows.append({
+            "mode": name,
+            "articles": len(latencies),
+            "failures": failures,
+            "p50_ms": np.percentile(latencies, 50) * 1000,
+            "p95_ms": np.percentile(latencies, 95) * 1000,
+            "p99_ms": np.percentile(latencies, 99) * 1000,
+            "max_ms": latencies.max() * 1000,
+        })
+    results = pd.DataFrame(rows)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    results.to_csv(OUTPUT_FILE, index=False)
+
+    print(f"✔ chunk_chars={chunk_chars}, overlap={overlap}, max_chars={max_chars}")
+    print(results)
+    print(f"✅ Benchmark saved to: {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+benchmark_quantized_encoder.py
+------------------------------
+Purpose:
+Quality + throughput check of the int8 (dynamic-quantized) CPU
+encoder against the fp32 SentenceTransformer.
+
+Quality:
+- cosine agreement: cosine(fp32 vector, int8 vector) per article
+- topic agreement: share of articles the saved topic model assigns
+  to the same topic from either set of embeddings
+
+Throughput is measured per core (torch limited to one thread).
+
+Input:
+data/processed/news_with_topics.csv (+ models/bertopic if fitted)
+
+Output:
+data/evaluation/quantized_encoder_benchmark.csv
+"""
+
+import os
+import time
+import numpy as np
+import pandas as pd
+import torch
+
+from src.features.resources import SENTENCE_MODEL, get_sentence_transformer
+from src.features.topic_model_store import load_topic_model, model_exists
+from src.features.topic_modeling import ENCODE_BATCH_SIZE, encode_texts
+
+OUTPUT_DIR = "data/evaluation"
+OUTPUT_FILE = f"{OUTPUT_DIR}/quantized_encoder_benchmark.csv"
+
+SAMPLE_SIZE = 2000
+N_THREADS = 1
+
+
+def timed_encode(backend, texts, batch_size):
+    model = get_sentence_transformer(SENTENCE_MODEL, backend=backend)
+    start = time.perf_counter()
+    vectors = encode_texts(model, texts, batch_size=batch_size)
+    return vectors, time.perf_counter() - start
+
+
+def row_cosine(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return (a * b).sum(axis=1)
+
+
+def main(sample_size=SAMPLE_SIZE, batch_size=ENCODE_BATCH_SIZE, n_threads=N_THREADS):
+    print("⏱️ Benchmarking int8 vs fp32 sentence encoder...")
+
+    torch.set_num_threads(n_threads)
+
+    texts = (
+        pd.read_csv("data/processed/news_with_topics.csv", usecols=["clean_text"])
+        .head(sample_size)["clean_text"].astype(str).tolist()
+    )
+
+    fp32, fp32_seconds = timed_encode("fp32", texts, batch_size)
+    int8, int8_seconds = timed_encode("int8", texts, batch_size)
+
+    cosine = row_cosine(fp32, int8)
+
+    topic_agreement = np.nan
+    if model_exists():
+        topic_model = load_topic_model(get_sentence_transformer(SENTENCE_MODEL))
+        fp32_topics, _ = topic_model.transform(texts, fp32)
+        int8_topics, _ = topic_model.transform(texts, int8)
+        topic_agreement = float((np.asarray(fp32_topics) == np.asarray(int8_topics)).mean())
+    else:
+        print("⚠️ No saved topic model → topic agreement skipped")
+
+    results = pd.DataFrame({
+        "backend": ["fp32", "int8"],
+        "docs": [len(texts), len(texts)],
+        "threads": [n_threads, n_threads],
+        "seconds": [fp32_seconds, int8_seconds],
+        "mean_cosine": [1.0, float(cosine.mean())],
+        "min_cosine": [1.0, float(cosine.min())],
+        "topic_agreement": [1.0, topic_agreement],
+    })
+    results["docs_per_sec"] = results["docs"] / results["seconds"]
+    results["speedup"] = fp32_seconds / results["seconds"]
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    results.to_csv(OUTPUT_FILE, index=False)
+
+    print(results)
+    print(f"✅ Benchmark saved to: {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
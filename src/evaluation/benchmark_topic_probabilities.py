@@ -0,0 +1,98 @@
+"""
+benchmark_topic_probabilities.py
+--------------------------------
+Purpose:
+Runtime and peak memory of the BERTopic fit with the full
+documents × topics probability matrix (probability_mode="full")
+versus the assigned-topic confidence only ("assigned").
+
+Both fits use the same precomputed embeddings and a seeded UMAP,
+so topic assignments can be compared directly.
+
+Input:
+data/processed/news_with_topics.csv + the embedding store
+
+Output:
+data/evaluation/topic_probability_benchmark.csv
+"""
+
+import os
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from bertopic import BERTopic
+from umap import UMAP
+
+from src.features.embedding_store import embeddings_for
+from src.features.topic_modeling import topic_confidence
+
+OUTPUT_DIR = "data/evaluation"
+OUTPUT_FILE = f"{OUTPUT_DIR}/topic_probability_benchmark.csv"
+
+SAMPLE_SIZE = 20_000
+SEED = 42
+
+
+def fit_topics(documents, embeddings, probability_mode):
+    """
+    One BERTopic fit; returns (topics, probs, seconds, peak MB).
+    """
+    topic_model = BERTopic(
+        umap_model=UMAP(
+            n_neighbors=15, n_components=5, min_dist=0.0,
+            metric="cosine", random_state=SEED
+        ),
+        calculate_probabilities=(probability_mode == "full"),
+        verbose=False
+    )
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    topics, probs = topic_model.fit_transform(documents, embeddings)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return np.asarray(topics), np.asarray(probs), seconds, peak / 1e6
+
+
+def main(sample_size=SAMPLE_SIZE):
+    print("⏱️ Benchmarking topic probabilities (full matrix vs assigned only)...")
+
+    df = pd.read_csv(
+        "data/processed/news_with_topics.csv", usecols=["article_id", "clean_text"]
+    ).head(sample_size)
+    documents = df["clean_text"].astype(str).tolist()
+    embeddings = embeddings_for(df["article_id"])
+
+    runs = {mode: fit_topics(documents, embeddings, mode) for mode in ["full", "assigned"]}
+
+    full_topics, full_probs = runs["full"][:2]
+    rows = []
+    for mode, (topics, probs, seconds, peak_mb) in runs.items():
+        rows.append({
+            "probability_mode": mode,
+            "documents": len(documents),
+            "seconds": seconds,
+            "peak_mb": peak_mb,
+            "probs_mb": probs.nbytes / 1e6,
+            "topic_agreement": float((topics == full_topics).mean()),
+            "confidence_corr": float(np.corrcoef(
+                topic_confidence(probs), topic_confidence(full_probs)
+            )[0, 1]),
+        })
+
+    results = pd.DataFrame(rows)
+    results["speedup"] = results["seconds"].iloc[0] / results["seconds"]
+    results["memory_saving"] = 1 - results["peak_mb"] / results["peak_mb"].iloc[0]
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    results.to_csv(OUTPUT_FILE, index=False)
+
+    print(results)
+    print(f"✅ Benchmark saved to: {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
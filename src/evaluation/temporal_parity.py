@@ -0,0 +1,79 @@
+"""
+temporal_parity.py
+------------------
+Purpose:
+Check that the online temporal detector (RollingWindow) makes the
+same decisions as the batch rolling(7, min_periods=3) version on
+the historical data.
+
+The history is replayed in date order, each day split into
+BATCHES_PER_DAY article batches, so both new-day pushes and
+same-day updates are exercised.
+
+Input:
+data/processed/news_with_temporal_features.csv
+
+Output:
+data/evaluation/temporal_parity.csv   (per-day batch vs online)
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+from src.models.temporal_anomaly import INPUT_PATH, RollingWindow, batch_daily
+
+OUTPUT_DIR = "data/evaluation"
+OUTPUT_FILE = f"{OUTPUT_DIR}/temporal_parity.csv"
+
+BATCHES_PER_DAY = 3
+SEED = 42
+
+
+def replay_online(df, batches_per_day=BATCHES_PER_DAY, seed=SEED):
+    rng = np.random.default_rng(seed)
+    window = RollingWindow()
+    rows = {}
+
+    for date, day in df.dropna(subset=["Date"]).groupby("Date", sort=True):
+        sizes = np.bincount(rng.integers(0, batches_per_day, len(day)), minlength=batches_per_day)
+        for size in sizes[sizes > 0]:
+            rows[date] = window.update(date, size)
+
+    return pd.DataFrame(list(rows.values()))
+
+
+def main():
+    print("⚖️ Checking online vs batch temporal anomaly parity...")
+
+    df = pd.read_csv(INPUT_PATH, usecols=["article_id", "Date"])
+    df["Date"] = pd.to_datetime(df["Date"])
+
+    batch = batch_daily(df)
+    online = replay_online(df)
+
+    merged = batch.merge(online, on="Date", suffixes=("_batch", "_online"))
+    same_count = (merged["article_count_batch"] == merged["article_count_online"]).all()
+    same_decision = merged["temporal_anomaly_batch"] == merged["temporal_anomaly_online"]
+    z_close = np.allclose(
+        merged["z_score_batch"].fillna(0), merged["z_score_online"].fillna(0), atol=1e-6
+    )
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    merged.to_csv(OUTPUT_FILE, index=False)
+
+    print(f"✔ {len(merged)} days compared, "
+          f"{int((merged['temporal_anomaly_batch'] == 'Anomaly').sum())} batch anomalies")
+    print(f"✔ Decisions identical: {bool(same_decision.all())} | "
+          f"counts identical: {bool(same_count)} | z-scores close: {z_close}")
+
+    if len(merged) != len(batch) or not same_count or not same_decision.all():
+        raise AssertionError(
+            f"Online detector differs from batch on {int((~same_decision).sum())} days "
+            f"(see {OUTPUT_FILE})"
+        )
+    print(f"✅ Parity confirmed → {OUTPUT_FILE}")
+
+
+if __name__ == "__main__":
+    main()
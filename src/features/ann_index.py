@@ -0,0 +1,235 @@
+"""
+ann_index.py
+------------
+Purpose:
+Approximate nearest-neighbour (HNSW) index over the article
+embeddings: "which articles are semantically closest to this
+one?" without brute force over the whole corpus.
+
+Shared infrastructure for dashboard lookups and anomaly features.
+
+Key Principles:
+✔ Keyed by article_id (used directly as the HNSW label)
+✔ Cosine space (same geometry as the sentence embeddings)
+✔ Incremental: only new / changed articles (or ones re-encoded
+  by another encoder) are inserted; a changed article's vector is
+  replaced in place, removed articles are marked deleted
+✔ Batch top-k queries
+
+Input:
+embedding store (data/processed/embeddings.npy)
+
+Output:
+models/ann/index.bin
+models/ann/index.json               (dim, space, build settings)
+models/ann/index.fingerprints.csv   (article_id, content_hash, encoder)
+"""
+
+import json
+import hnswlib
+import numpy as np
+from pathlib import Path
+
+from src.features.embedding_store import load_embeddings
+from src.features.incremental import (
+    HASH_COLUMN,
+    changed_mask,
+    fingerprint_path,
+    load_previous,
+)
+
+ANN_DIR = Path("models/ann")
+
+SPACE = "cosine"
+
+# HNSW graph settings: M = links per node, ef_* = candidate list sizes
+# (higher → better recall, slower build / query)
+M = 16
+EF_CONSTRUCTION = 200
+EF_SEARCH = 64
+
+# Rows per add_items() call when building
+ADD_BATCH = 50_000
+
+
+def index_path(ann_dir=ANN_DIR):
+    return Path(ann_dir) / "index.bin"
+
+
+def meta_path(ann_dir=ANN_DIR):
+    return Path(ann_dir) / "index.json"
+
+
+class ArticleIndex:
+    """
+    HNSW index whose labels are article_ids.
+    """
+
+    def __init__(self, dim, space=SPACE, max_elements=1000, m=M,
+                 ef_construction=EF_CONSTRUCTION, ef_search=EF_SEARCH):
+        self.dim = dim
+        self.space = space
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+
+        self.index = hnswlib.Index(space=space, dim=dim)
+        self.index.init_index(
+            max_elements=max_elements, M=m, ef_construction=ef_construction
+        )
+        self.index.set_ef(ef_search)
+        self.deleted = set()
+
+    def __len__(self):
+        """
+        Live articles (mark_deleted ones are still in the HNSW count).
+        """
+        return self.index.get_current_count() - len(self.deleted)
+
+    # -------------------------------
+    # Inserts
+    # -------------------------------
+    def add(self, article_ids, vectors):
+        """
+        Insert vectors; an existing article_id is updated in place.
+        """
+        article_ids = np.asarray(article_ids, dtype=np.int64)
+        if len(article_ids) == 0:
+            return
+
+        needed = self.index.get_current_count() + len(article_ids)
+        if needed > self.index.get_max_elements():
+            self.index.resize_index(max(needed, 2 * self.index.get_max_elements()))
+
+        self.index.add_items(np.asarray(vectors, dtype=np.float32), article_ids)
+        # Re-adding a deleted label updates and un-deletes it
+        self.deleted.difference_update(article_ids.tolist())
+
+    def remove(self, article_ids):
+        """
+        Hide articles from query results (HNSW marks them deleted).
+        """
+        for article_id in article_ids:
+            article_id = int(article_id)
+            if article_id not in self.deleted:
+                self.index.mark_deleted(article_id)
+                self.deleted.add(article_id)
+
+    # -------------------------------
+    # Queries
+    # -------------------------------
+    def query(self, vectors, k=10):
+        """
+        Top-k neighbours for a batch of vectors.
+        Returns (article_ids, distances), both shaped (n, k).
+        Cosine distance = 1 - cosine similarity.
+        """
+        k = min(k, len(self))
+        self.index.set_ef(max(self.ef_search, k))
+        labels, distances = self.index.knn_query(np.asarray(vectors, dtype=np.float32), k=k)
+        return labels.astype(np.int64), distances
+
+    def neighbors(self, article_ids, k=10):
+        """
+        Top-k neighbours of indexed articles, excluding themselves.
+        """
+        article_ids = np.asarray(article_ids, dtype=np.int64)
+        vectors = np.asarray(self.index.get_items(article_ids), dtype=np.float32)
+        labels, distances = self.query(vectors, k=k + 1)
+
+        out_labels = np.empty((len(article_ids), k), dtype=np.int64)
+        out_distances = np.empty((len(article_ids), k), dtype=np.float32)
+        for i, (row_labels, row_distances) in enumerate(zip(labels, distances)):
+            keep = row_labels != article_ids[i]
+            out_labels[i] = row_labels[keep][:k]
+            out_distances[i] = row_distances[keep][:k]
+        return out_labels, out_distances
+
+    # -------------------------------
+    # Persistence
+    # -------------------------------
+    def save(self, ann_dir=ANN_DIR):
+        ann_dir = Path(ann_dir)
+        ann_dir.mkdir(parents=True, exist_ok=True)
+        self.index.save_index(str(index_path(ann_dir)))
+
+        with open(meta_path(ann_dir), "w") as f:
+            json.dump({
+                "dim": self.dim,
+                "space": self.space,
+                "m": self.m,
+                "ef_construction": self.ef_construction,
+                "ef_search": self.ef_search,
+                "deleted": sorted(self.deleted),
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, ann_dir=ANN_DIR):
+        with open(meta_path(ann_dir)) as f:
+            meta = json.load(f)
+
+        self = cls.__new__(cls)
+        self.dim = meta["dim"]
+        self.space = meta["space"]
+        self.m = meta["m"]
+        self.ef_construction = meta["ef_construction"]
+        self.ef_search = meta["ef_search"]
+        self.deleted = set(meta.get("deleted", []))
+
+        self.index = hnswlib.Index(space=self.space, dim=self.dim)
+        self.index.load_index(str(index_path(ann_dir)))
+        self.index.set_ef(self.ef_search)
+        return self
+
+
+def index_exists(ann_dir=ANN_DIR):
+    return index_path(ann_dir).exists() and meta_path(ann_dir).exists()
+
+
+# -------------------------------
+# Build / update from the embedding store
+# -------------------------------
+def main(incremental=True, ann_dir=ANN_DIR):
+    print("🧭 Building ANN index over article embeddings...")
+
+    index, embeddings = load_embeddings()
+
+    previous = None
+    if incremental and index_exists(ann_dir):
+        ann = ArticleIndex.load(ann_dir)
+        previous = load_previous(fingerprint_path(index_path(ann_dir)), ["encoder"])
+    else:
+        ann = ArticleIndex(embeddings.shape[1], max_elements=max(len(index), 1))
+
+    changed = changed_mask(index, previous).to_numpy().copy()
+
+    # Vectors re-encoded by another encoder count as changed
+    if previous is not None and "encoder" in index.columns:
+        stored = index[["article_id", HASH_COLUMN]].merge(
+            previous, on=["article_id", HASH_COLUMN], how="left"
+        )["encoder"]
+        changed |= (stored.fillna("") != index["encoder"].fillna("")).to_numpy()
+
+    rows = np.flatnonzero(changed)
+
+    # Articles no longer in the corpus
+    if previous is not None:
+        gone = set(previous["article_id"]) - set(index["article_id"])
+        ann.remove(sorted(gone))
+
+    for start in range(0, len(rows), ADD_BATCH):
+        batch = rows[start:start + ADD_BATCH]
+        ann.add(index["article_id"].to_numpy()[batch], embeddings[batch])
+
+    ann.save(ann_dir)
+    index.reindex(columns=["article_id", HASH_COLUMN, "encoder"]).to_csv(
+        fingerprint_path(index_path(ann_dir)), index=False
+    )
+
+    print(f"♻️ Incremental: reused {int((~changed).sum())}, "
+          f"inserted {len(rows)} articles")
+    print(f"✅ ANN index saved → {index_path(ann_dir)} ({len(ann)} articles)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,47 @@
 import pandas as pd
-import spacy
 from pathlib import Path
 
-nlp = spacy.load("en_core_web_sm")
+# Shared NER-only SpaCy model + entity table
+from src.features.entity_extraction import (
+    ENTITIES_PATH,
+    entity_table_covers,
+    load_entities,
+    owned_entities,
+    pipe_windows,
+)
+from src.features.incremental import (
+    HASH_COLUMN,
+    add_content_hash,
+    changed_mask,
+    fingerprint_path,
+    load_previous,
+)
 
 def extract_organizations(text):
     if not isinstance(text, str):
         return []
-    doc = nlp(text)
+    # Long texts are parsed in overlapping chunks, entities merged
     return list(set(
         ent.text.strip()
-        for ent in doc.ents
+        for _, doc in pipe_windows([text])
+        for ent, _, _ in owned_entities(doc)
         if ent.label_ == "ORG" and len(ent.text.strip()) > 2
     ))
 
-def main():
-    print("🏷️ Extracting organizations from RAW text (Heading + Article)...")
-
-    base = Path("data/processed")
-    df = pd.read_csv(base / "final_anomaly_results.csv")
+def organizations_from_entities(entities):
+    """
+    Same ORG rule as extract_organizations(), as a filter over the
+    shared entity table (Heading + Article entities of each article).
+    """
+    orgs = entities[entities["label"] == "ORG"][["article_id", "text"]].copy()
+    orgs["organization"] = orgs["text"].astype(str).str.strip()
+    orgs = orgs[orgs["organization"].str.len() > 2]
+    return orgs[["article_id", "organization"]].drop_duplicates()
 
+def ner_organizations(df):
+    """
+    ORG mentions parsed here, one row per (article_id, organization).
+    """
     rows = []
 
     for _, row in df.iterrows():
@@ -33,9 +55,59 @@ def main():
                 "organization": org
             })
 
-    brand_df = pd.DataFrame(rows).drop_duplicates()
+    return pd.DataFrame(rows, columns=["article_id", "organization"])
+
+def main(incremental=True, use_entities=True):
+    print("🏷️ Extracting organizations from RAW text (Heading + Article)...")
+
+    base = Path("data/processed")
+    output_path = base / "article_brands.csv"
+    df = pd.read_csv(base / "final_anomaly_results.csv")
+
+    # ♻️ Fingerprints live in a sidecar file (many rows per article here)
+    add_content_hash(df)
+    previous = None
+    if incremental and output_path.exists():
+        previous = load_previous(fingerprint_path(output_path))
+    changed = changed_mask(df, previous)
+
+    delta = df[changed]
+    covered = pd.Series(False, index=delta.index)
+    parts = [pd.DataFrame(columns=["article_id", "organization"])]
+
+    if use_entities and ENTITIES_PATH.exists():
+        # ✅ Cheap filter over the shared NER pass (no re-parsing),
+        # only for articles whose current content is in the table
+        print(f"✔ Using entity table: {ENTITIES_PATH}")
+        covered = entity_table_covers(delta)
+        parts.append(organizations_from_entities(
+            load_entities(labels=["ORG"], article_ids=delta.loc[covered, "article_id"])
+        ))
+        if (~covered).any():
+            print(f"⚠️ {int((~covered).sum())} articles missing or stale in "
+                  f"{ENTITIES_PATH} → running NER on them")
+
+    if (~covered).any():
+        parts.append(ner_organizations(delta[~covered]))
+    brand_df = pd.concat(parts, ignore_index=True)
+
+    # Keep previous mentions of unchanged articles
+    if previous is not None:
+        unchanged_ids = df.loc[~changed, "article_id"]
+        old_brands = pd.read_csv(output_path)
+        brand_df = pd.concat([
+            old_brands[old_brands["article_id"].isin(unchanged_ids)],
+            brand_df
+        ])
+        brand_df = brand_df.sort_values("article_id", kind="stable")
+
+    brand_df = brand_df.drop_duplicates()
+
+    brand_df.to_csv(output_path, index=False)
+    df[["article_id", HASH_COLUMN]].to_csv(fingerprint_path(output_path), index=False)
 
-    brand_df.to_csv(base / "article_brands.csv", index=False)
+    print(f"♻️ Incremental: reused {int((~changed).sum())}, "
+          f"recomputed {int(changed.sum())} articles")
     print(f"✅ Extracted {len(brand_df)} organization mentions")
 
 if __name__ == "__main__":
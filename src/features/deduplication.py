@@ -0,0 +1,228 @@
+"""
+deduplication.py
+----------------
+Purpose:
+Dedup pre-stage, run right after text_cleaning: every article
+gets a canonical_id (its group's representative article), so the
+expensive stages (spaCy NER, VADER, SentenceTransformer) only run
+once per group and fan their results back out to every article_id.
+
+Modes:
+- "exact" (default): same content_hash (Heading + Article)
+  → fan-out is lossless for every stage; groups come straight
+  from the content_hash, no map file is needed
+- "near": additionally merge near-exact copies (MinHash Jaccard
+  ≥ NEAR_THRESHOLD on clean_text, see near_duplicates.py)
+
+Key Principles:
+✔ canonical_id = smallest article_id in the group
+✔ Map rows hold the content_hash they were built from; articles
+  that changed (or are new) since then fall back to exact groups
+✔ Each stage logs how much it skipped (dedup_savings.csv)
+
+Input:
+data/processed/news_cleaned.csv
+
+Output:
+data/processed/canonical_map.csv    article_id, content_hash, canonical_id
+                                    (near mode only)
+data/processed/dedup_savings.csv    stage, articles, computed, saved
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from src.features.incremental import HASH_COLUMN, add_content_hash
+from src.features.near_duplicates import UnionFind, cluster_near_duplicates
+
+INPUT_PATH = Path("data/processed/news_cleaned.csv")
+MAP_PATH = Path("data/processed/canonical_map.csv")
+SAVINGS_PATH = Path("data/processed/dedup_savings.csv")
+
+DEDUP_MODE = "exact"
+
+# Near-exact copies only (much stricter than recycled-narrative clusters)
+NEAR_THRESHOLD = 0.95
+
+
+# -----------------------------
+# Building the map
+# -----------------------------
+def canonical_map(df, mode=DEDUP_MODE, near_threshold=NEAR_THRESHOLD):
+    """
+    article_id → canonical_id for every article of df.
+    """
+    add_content_hash(df)
+    article_ids = df["article_id"].to_numpy()
+
+    # Exact: one group per content_hash
+    groups = pd.factorize(df[HASH_COLUMN])[0]
+
+    if mode == "near":
+        # Join exact groups and near-exact clusters sharing any member
+        roots = cluster_near_duplicates(df["clean_text"], threshold=near_threshold)
+        firsts = pd.Series(np.arange(len(df))).groupby(groups).transform("min").to_numpy()
+
+        uf = UnionFind(len(df))
+        for i in range(len(df)):
+            uf.union(i, roots[i])
+            uf.union(i, firsts[i])
+        groups = np.array([uf.find(i) for i in range(len(df))])
+    elif mode != "exact":
+        raise ValueError(f"Unknown dedup mode: {mode}")
+
+    canonical = pd.Series(article_ids).groupby(groups).transform("min")
+    return pd.DataFrame({
+        "article_id": article_ids,
+        HASH_COLUMN: df[HASH_COLUMN].to_numpy(),
+        "canonical_id": canonical.to_numpy(),
+    })
+
+
+def load_canonical_map(path=MAP_PATH):
+    if not Path(path).exists():
+        return None
+    mapping = pd.read_csv(path)
+    if HASH_COLUMN not in mapping.columns:     # map from before content hashes
+        return None
+    return mapping.drop_duplicates("article_id", keep="last")
+
+
+def exact_canonical_ids(df):
+    """
+    Smallest article_id sharing the row's content_hash.
+    """
+    add_content_hash(df)
+    return df.groupby(HASH_COLUMN)["article_id"].transform("min")
+
+
+def canonical_ids(df, mapping=None):
+    """
+    canonical_id per row of df.
+
+    Map groups are used only while still valid: the row's
+    content_hash matches the map and so does the hash of the
+    group's canonical article. Everything else (new, edited, or
+    in a group whose canonical changed) uses exact content_hash
+    groups, which can never collide with a valid group's id.
+    """
+    exact = exact_canonical_ids(df)
+
+    if mapping is None:
+        mapping = load_canonical_map()
+    if mapping is None:
+        return exact
+
+    matched = df[["article_id", HASH_COLUMN]].merge(
+        mapping, on=["article_id", HASH_COLUMN], how="left"
+    )["canonical_id"]
+    matched.index = df.index
+
+    # Group valid ⇔ its canonical article is in df with its mapped hash
+    valid_ids = df.loc[matched == df["article_id"], "article_id"]
+    valid = matched.isin(valid_ids)
+
+    return exact.where(~valid, matched).astype(df["article_id"].dtype)
+
+
+# -----------------------------
+# Using the map in a stage
+# -----------------------------
+def record_savings(stage, n_articles, n_computed, path=SAVINGS_PATH):
+    saved = n_articles - n_computed
+    row = pd.DataFrame([{
+        "run_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "stage": stage,
+        "articles": n_articles,
+        "computed": n_computed,
+        "saved": saved,
+        "saved_share": round(saved / n_articles, 4) if n_articles else 0.0,
+    }])
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    row.to_csv(path, mode="a", header=not path.exists(), index=False)
+
+    print(f"🧮 Dedup [{stage}]: computed {n_computed} of {n_articles} articles "
+          f"({saved} duplicates skipped)")
+
+
+def dedup_apply(df, compute_fn, stage, mapping=None):
+    """
+    Run compute_fn on one representative row per canonical_id and
+    fan the result out to every row of df.
+
+    compute_fn(reps_df) returns either a DataFrame indexed like
+    reps_df or an array with one row per rep; the result has the
+    same type, aligned to df.
+    """
+    codes, _ = pd.factorize(canonical_ids(df, mapping))
+    first = np.unique(codes, return_index=True)[1]
+    reps = df.iloc[first]
+
+    result = compute_fn(reps)
+    record_savings(stage, len(df), len(reps))
+
+    if isinstance(result, pd.DataFrame):
+        out = result.iloc[codes]
+        out.index = df.index
+        return out
+    return np.asarray(result)[codes]
+
+
+def fan_out_rows(table, df, mapping=None):
+    """
+    For row tables keyed by article_id (e.g. entities): rows of each
+    representative are copied to every article of its group in df.
+    `table` must hold the rows of the representatives picked by
+    representatives(df).
+    """
+    canonical = canonical_ids(df, mapping)
+    rep_ids = df.loc[representatives_mask(canonical), "article_id"]
+    rep_of_group = pd.Series(rep_ids.to_numpy(), index=canonical[rep_ids.index].to_numpy())
+
+    members = pd.DataFrame({
+        "rep_id": canonical.map(rep_of_group).to_numpy(),
+        "member_id": df["article_id"].to_numpy(),
+    })
+    out = table.merge(members, left_on="article_id", right_on="rep_id", how="inner")
+    out["article_id"] = out["member_id"]
+    return out[table.columns]
+
+
+def representatives_mask(canonical):
+    return ~canonical.duplicated()
+
+
+def representatives(df, mapping=None):
+    """
+    First row of df per canonical_id.
+    """
+    return df[representatives_mask(canonical_ids(df, mapping))]
+
+
+# -----------------------------
+# Main pipeline
+# -----------------------------
+def main(mode=DEDUP_MODE):
+    print(f"🪞 Building canonical article map (mode={mode})...")
+
+    df = pd.read_csv(INPUT_PATH)
+    mapping = canonical_map(df, mode=mode)
+
+    n_groups = mapping["canonical_id"].nunique()
+    print(f"✔ {len(mapping)} articles → {n_groups} representatives "
+          f"({len(mapping) - n_groups} duplicates)")
+
+    if mode == "exact":
+        # Stages group by content_hash directly; a leftover near map would override that
+        MAP_PATH.unlink(missing_ok=True)
+        print("✅ Exact mode: stages group by content_hash (no map file)")
+        return
+
+    mapping.to_csv(MAP_PATH, index=False)
+    print(f"✅ Saved → {MAP_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+dict_encoding.py
+----------------
+Purpose:
+Evaluate per-row transforms once per DISTINCT value.
+
+Location names, anomaly labels and risk bands have a handful of
+distinct values but one row per article. Each helper factorizes
+the input into integer codes + uniques, applies the function to
+the uniques only, and broadcasts the results back via the codes.
+
+Key Principles:
+✔ Same results (values and dtypes) as Series.apply / Series.map
+✔ Missing values are treated as one more distinct value
+✔ Output index always matches the input index
+"""
+
+import pandas as pd
+
+
+def map_unique(series, func):
+    """
+    Same as series.apply(func), evaluated once per distinct value.
+    For a dict lookup use map_unique(series, mapping.get).
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    mapped = pd.Series([func(value) for value in uniques])
+    result = mapped.take(codes)
+    result.index = series.index
+    result.name = series.name
+    return result
+
+
+def map_unique_frame(series, func, columns):
+    """
+    For a func returning a tuple: one output column per element,
+    e.g. clean_location() → (location_clean, location_type).
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    mapped = pd.DataFrame([func(value) for value in uniques], columns=columns)
+    result = mapped.take(codes)
+    result.index = series.index
+    return result
+
+
+def map_unique_rows(frame, func):
+    """
+    Same as frame.apply(lambda r: func(*r), axis=1), evaluated once
+    per distinct combination of the frame's columns.
+    """
+    keys = list(frame.columns)
+    codes = frame.groupby(keys, sort=False, dropna=False).ngroup().to_numpy()
+    uniques = frame.drop_duplicates(keys)  # same order as ngroup(sort=False)
+    mapped = pd.Series([func(*row) for row in uniques.itertuples(index=False)])
+    result = mapped.take(codes)
+    result.index = frame.index
+    return result
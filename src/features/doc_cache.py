@@ -0,0 +1,138 @@
+"""
+doc_cache.py
+------------
+Purpose:
+Persist parsed spaCy Docs (DocBin format) keyed by article
+fingerprint, so entity rules can be re-run over the corpus
+without re-parsing it.
+
+Layout:
+data/processed/doc_cache/
+    shard_00000.spacy   ← DocBin with up to SHARD_SIZE docs
+    index.csv           ← content_hash, field, offset, config, shard, position
+
+Long texts are parsed in windows (see entity_extraction), so one
+field may have several docs, told apart by their char offset.
+`config` stamps the model + window settings the docs were parsed
+with; docs under another config are treated as cache misses.
+
+Key Principles:
+✔ Docs are written shard by shard while parsing (bounded memory)
+✔ Docs are streamed back lazily, one shard in memory at a time
+✔ Identical content (same content_hash) is stored once
+"""
+
+import pandas as pd
+from pathlib import Path
+
+DOC_CACHE_DIR = Path("data/processed/doc_cache")
+SHARD_SIZE = 1000
+
+INDEX_COLUMNS = ["content_hash", "field", "offset", "config", "shard", "position"]
+
+
+# -----------------------------
+# Index
+# -----------------------------
+def index_path(cache_dir=DOC_CACHE_DIR):
+    return Path(cache_dir) / "index.csv"
+
+
+def load_index(cache_dir=DOC_CACHE_DIR, config=None):
+    """
+    One row per cached doc (empty if nothing is cached yet),
+    only docs parsed under `config` when given.
+    """
+    path = index_path(cache_dir)
+    if not path.exists():
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+
+    index = pd.read_csv(path, dtype={"config": str}, keep_default_na=False)
+    if "offset" not in index.columns:
+        index["offset"] = 0   # caches written before windowing
+    if "config" not in index.columns:
+        index["config"] = ""  # unknown settings → never matches
+    if config is not None:
+        index = index[index["config"] == config]
+    return index[INDEX_COLUMNS]
+
+
+def cached_hashes(cache_dir=DOC_CACHE_DIR, config=None):
+    return set(load_index(cache_dir, config)["content_hash"])
+
+
+# -----------------------------
+# Writing
+# -----------------------------
+def write_through(records, cache_dir=DOC_CACHE_DIR, shard_size=SHARD_SIZE, config=""):
+    """
+    Pass (content_hash, field, doc, ...) records through unchanged
+    while saving each doc to the cache in DocBin shards.
+    """
+    from spacy.tokens import DocBin   # spaCy is only imported when used
+
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    existing = load_index(cache_dir)
+    current = existing[existing["config"] == config]
+    seen = set(zip(current["content_hash"], current["field"], current["offset"]))
+    next_shard = int(existing["shard"].max()) + 1 if len(existing) else 0
+
+    # user_data carries the window offsets of chunked docs
+    doc_bin = DocBin(store_user_data=True)
+    rows = []
+
+    def flush():
+        nonlocal doc_bin, rows, next_shard
+        if not rows:
+            return
+        doc_bin.to_disk(cache_dir / f"shard_{next_shard:05d}.spacy")
+        pd.DataFrame(rows, columns=INDEX_COLUMNS).to_csv(
+            index_path(cache_dir),
+            mode="a",
+            header=not index_path(cache_dir).exists(),
+            index=False
+        )
+        doc_bin, rows = DocBin(store_user_data=True), []
+        next_shard += 1
+
+    for record in records:
+        content_hash, field, doc = record[:3]
+        offset = doc.user_data.get("window", (0,))[0]
+        if (content_hash, field, offset) not in seen:
+            seen.add((content_hash, field, offset))
+            rows.append((content_hash, field, offset, config, next_shard, len(doc_bin)))
+            doc_bin.add(doc)
+            if len(rows) >= shard_size:
+                flush()
+        yield record
+
+    flush()
+
+
+# -----------------------------
+# Reading
+# -----------------------------
+def iter_docs(vocab, cache_dir=DOC_CACHE_DIR, hashes=None, config=None):
+    """
+    Lazily yield (content_hash, field, doc) from the cache.
+
+    Only shards containing a requested hash are read, and only
+    one shard is held in memory at a time.
+    """
+    from spacy.tokens import DocBin
+
+    cache_dir = Path(cache_dir)
+    index = load_index(cache_dir, config)
+    if hashes is not None:
+        index = index[index["content_hash"].isin(hashes)]
+
+    for shard, entries in index.groupby("shard", sort=True):
+        doc_bin = DocBin().from_disk(cache_dir / f"shard_{shard:05d}.spacy")
+        wanted = dict(zip(entries["position"], zip(entries["content_hash"], entries["field"])))
+
+        for position, doc in enumerate(doc_bin.get_docs(vocab)):
+            if position in wanted:
+                content_hash, field = wanted[position]
+                yield content_hash, field, doc
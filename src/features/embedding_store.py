@@ -0,0 +1,164 @@
+"""
+embedding_store.py
+------------------
+Purpose:
+Binary store for article embeddings, replacing the stringified
+`embedding` list column of news_with_topics.csv.
+
+Key Principles:
+✔ One .npy matrix (float32, optionally float16), row i = index row i
+✔ article_id (+ content_hash, encoder) index in a small CSV next to it
+✔ Stored vectors are only reused for the same encoder
+  (model:backend) → fp32 / int8 vectors are never mixed
+✔ Loading is a read-only memmap → zero-copy, no parsing, no eval
+✔ Both files written to temp files, then renamed (matrix first,
+  index last) → a reader never sees a half-written file
+
+Files:
+data/processed/embeddings.npy
+data/processed/embeddings_index.csv
+    article_id, content_hash, encoder, row
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from src.features.incremental import (
+    HASH_COLUMN,
+    add_content_hash,
+    changed_mask,
+    load_previous,
+)
+
+EMBEDDINGS_PATH = Path("data/processed/embeddings.npy")
+
+# float16 halves the file; consumers cast to float32 where needed
+EMBEDDING_DTYPE = np.float32
+
+INDEX_COLUMNS = ["article_id", HASH_COLUMN, "encoder", "row"]
+
+
+def index_path(path=EMBEDDINGS_PATH):
+    path = Path(path)
+    return path.with_name(f"{path.stem}_index.csv")
+
+
+# -----------------------------
+# Writing
+# -----------------------------
+def save_embeddings(article_ids, vectors, content_hashes=None, encoder=None,
+                    path=EMBEDDINGS_PATH, dtype=EMBEDDING_DTYPE):
+    """
+    Write the embedding matrix and its article_id index.
+    Row i of `vectors` belongs to article_ids[i]; `encoder` names the
+    model:backend that produced them.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    vectors = np.asarray(vectors, dtype=dtype)
+
+    if len(vectors) != len(article_ids):
+        raise ValueError("One embedding row per article_id expected")
+
+    index = pd.DataFrame({
+        "article_id": list(article_ids),
+        HASH_COLUMN: list(content_hashes) if content_hashes is not None else None,
+        "encoder": encoder,
+        "row": np.arange(len(vectors)),
+    }, columns=INDEX_COLUMNS)
+
+    # Readers may hold a memmap of the old file → write then rename.
+    # The index is renamed last: it is what marks the store as updated.
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, vectors)
+    tmp_index = index_path(path).with_name(f"{index_path(path).name}.tmp")
+    index.to_csv(tmp_index, index=False)
+
+    os.replace(tmp, path)
+    os.replace(tmp_index, index_path(path))
+
+
+# -----------------------------
+# Reading
+# -----------------------------
+def load_index(path=EMBEDDINGS_PATH):
+    """
+    article_id → row index of the store, or None if there is no store.
+    """
+    if not Path(path).exists() or not index_path(path).exists():
+        return None
+    return pd.read_csv(index_path(path))
+
+
+def load_embeddings(path=EMBEDDINGS_PATH):
+    """
+    (index, matrix): the matrix is a read-only memmap view of the
+    file in its stored dtype (nothing is copied or parsed).
+    """
+    index = load_index(path)
+    if index is None:
+        raise FileNotFoundError(f"No embedding store at {path} (run topic_modeling)")
+
+    matrix = np.load(path, mmap_mode="r")
+    if len(matrix) != len(index):
+        raise ValueError("Embedding store and its index are out of sync")
+    return index, matrix
+
+
+def embeddings_for(article_ids, path=EMBEDDINGS_PATH, dtype=np.float32):
+    """
+    Embeddings aligned to article_ids (a copy, cast to dtype).
+    """
+    index, matrix = load_embeddings(path)
+    rows = pd.Series(index["row"].values, index=index["article_id"])
+    rows = rows[~rows.index.duplicated(keep="last")]
+
+    wanted = pd.Index(article_ids)
+    missing = wanted.difference(rows.index)
+    if len(missing):
+        raise KeyError(f"{len(missing)} article_ids have no stored embedding")
+
+    return np.asarray(matrix[rows.loc[wanted].to_numpy()], dtype=dtype)
+
+
+# -----------------------------
+# Incremental reuse
+# -----------------------------
+def incremental_embeddings(df, compute_fn, dim, encoder=None, path=EMBEDDINGS_PATH):
+    """
+    float32 embeddings aligned to df's rows: unchanged articles
+    (same article_id + content_hash, stored by the same encoder)
+    are read from the store, compute_fn(delta_df) → array encodes
+    the rest.
+    """
+    add_content_hash(df)
+    previous = None
+    if Path(path).exists():
+        previous = load_previous(index_path(path), ["row", "encoder"])
+    if previous is not None:
+        same_encoder = previous["encoder"] == encoder
+        if not same_encoder.all():
+            print(f"↻ {int((~same_encoder).sum())} stored embeddings from another "
+                  f"encoder → re-encoding them with {encoder}")
+        previous = previous[same_encoder]
+
+    changed = changed_mask(df, previous).to_numpy()
+
+    embeddings = np.empty((len(df), dim), dtype=np.float32)
+
+    if previous is not None and (~changed).any():
+        rows = df.loc[~changed, ["article_id", HASH_COLUMN]].merge(
+            previous, on=["article_id", HASH_COLUMN], how="left"
+        )["row"].to_numpy()
+        embeddings[~changed] = np.load(path, mmap_mode="r")[rows]
+
+    if changed.any():
+        embeddings[changed] = compute_fn(df.loc[changed])
+
+    print(f"♻️ Incremental: reused {int((~changed).sum())}, "
+          f"recomputed {int(changed.sum())} articles")
+
+    return embeddings
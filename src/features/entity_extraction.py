@@ -0,0 +1,344 @@
+"""
+entity_extraction.py
+--------------------
+Purpose:
+Run spaCy NER ONCE per article and keep every entity in a
+single table, so location and brand logic become cheap filters
+instead of each stage re-parsing the corpus.
+
+Key Principles:
+✔ Heading and Article are each parsed exactly once
+✔ RAW text (not clean_text) → casing / punctuation help NER
+✔ One row = one entity mention
+✔ Parsed docs are cached (doc_cache) → rules can be re-run
+  with incremental=False without re-parsing anything
+
+Input:
+data/processed/news_cleaned.csv
+
+Output:
+data/processed/article_entities.csv
+    article_id, field, label, text, start_char, end_char
+"""
+
+import pandas as pd
+from pathlib import Path
+
+from src.features.deduplication import (
+    fan_out_rows,
+    load_canonical_map,
+    record_savings,
+    representatives,
+)
+from src.features.doc_cache import (
+    DOC_CACHE_DIR,
+    cached_hashes,
+    iter_docs,
+    write_through,
+)
+from src.features.incremental import (
+    HASH_COLUMN,
+    add_content_hash,
+    changed_mask,
+    fingerprint_path,
+    load_previous,
+)
+from src.features.resources import SPACY_MODEL, get_spacy
+
+# -----------------------------
+# SpaCy NER model (shared, lazy)
+# -----------------------------
+# Only entities are used → skip tagger, parser and lemmatizer
+NER_ONLY_EXCLUDE = ("tagger", "parser", "attribute_ruler", "lemmatizer", "senter")
+
+
+def get_nlp():
+    """
+    The shared NER-only pipeline, loaded on first use.
+    """
+    return get_spacy(SPACY_MODEL, exclude=NER_ONLY_EXCLUDE)
+
+
+# nlp.pipe defaults
+BATCH_SIZE = 64
+N_PROCESS = 1
+
+# Long-article windowing: every nlp() call sees at most CHUNK_CHARS,
+# neighbouring chunks share CHUNK_OVERLAP chars so boundary entities
+# are seen whole. MAX_ARTICLE_CHARS caps the chars parsed per field.
+CHUNK_CHARS = 5000
+CHUNK_OVERLAP = 200
+MAX_ARTICLE_CHARS = None
+
+ENTITY_FIELDS = ["Heading", "Article"]
+ENTITY_COLUMNS = ["article_id", "field", "label", "text", "start_char", "end_char"]
+ENTITIES_PATH = Path("data/processed/article_entities.csv")
+
+
+# -----------------------------
+# Windowing
+# -----------------------------
+def window_spans(text, chunk_chars=CHUNK_CHARS, overlap=CHUNK_OVERLAP,
+                 max_chars=MAX_ARTICLE_CHARS):
+    """
+    Split text into overlapping chunks for NER.
+
+    Yields (start, end, own_start, own_end): the chunk is
+    text[start:end] and it "owns" entities starting inside
+    [own_start, own_end). Owned regions tile the text exactly,
+    so merging owned entities never double-counts.
+    """
+    if chunk_chars <= 2 * overlap:
+        raise ValueError("chunk_chars must be more than twice the overlap")
+
+    total = len(text) if max_chars is None else min(len(text), max_chars)
+    half = overlap // 2
+    start = 0
+
+    while True:
+        end = min(start + chunk_chars, total)
+
+        # Cut on whitespace so words are not split
+        if end < total:
+            cut = text.rfind(" ", start + overlap + 1, end)
+            if cut != -1:
+                end = cut
+
+        own_start = start if start == 0 else start + half
+        own_end = total if end >= total else end - overlap + half
+        yield start, end, own_start, own_end
+
+        if end >= total:
+            break
+        start = end - overlap
+
+
+def window_config(chunk_chars=CHUNK_CHARS, overlap=CHUNK_OVERLAP,
+                  max_chars=MAX_ARTICLE_CHARS, model=SPACY_MODEL):
+    """
+    Doc cache stamp: docs parsed under other settings are misses.
+    """
+    return f"{model}|chunk={chunk_chars}|overlap={overlap}|max={max_chars}"
+
+
+def head_window(text, max_chars):
+    """
+    First ~max_chars of text, cut at a sentence end when possible.
+    """
+    if max_chars is None or len(text) <= max_chars:
+        return text
+
+    cut = text.rfind(". ", 0, max_chars)
+    if cut > max_chars // 2:
+        return text[:cut + 1]
+
+    cut = text.rfind(" ", 0, max_chars)
+    return text[:cut] if cut > 0 else text[:max_chars]
+
+
+def pipe_windows(texts, batch_size=BATCH_SIZE, n_process=N_PROCESS, **window_kw):
+    """
+    nlp.pipe over the windows of many texts at once.
+    Yields (text_index, doc); doc.user_data["window"] holds
+    (offset, own_start, own_end) for entities_from_docs().
+    """
+    items = [
+        (i, text[start:end], (start, own_start, own_end))
+        for i, text in enumerate(texts)
+        for start, end, own_start, own_end in window_spans(text, **window_kw)
+    ]
+
+    docs = get_nlp().pipe(
+        (chunk for _, chunk, _ in items),
+        batch_size=batch_size,
+        n_process=n_process
+    )
+    for (i, _, window), doc in zip(items, docs):
+        doc.user_data["window"] = window
+        yield i, doc
+
+
+def owned_entities(doc):
+    """
+    (ent, start_char, end_char) for the entities a windowed doc
+    owns, with offsets relative to the full text.
+    """
+    offset, own_start, own_end = doc.user_data.get("window", (0, 0, len(doc.text)))
+    for ent in doc.ents:
+        start = ent.start_char + offset
+        if own_start <= start < own_end:
+            yield ent, start, ent.end_char + offset
+
+
+# -----------------------------
+# Extraction
+# -----------------------------
+def parse_fields(df, batch_size=BATCH_SIZE, n_process=N_PROCESS, **window_kw):
+    """
+    Parse every non-empty field in ENTITY_FIELDS once (long texts
+    in windows). Yields (content_hash, field, doc, article_id).
+    """
+    add_content_hash(df)
+
+    for field in ENTITY_FIELDS:
+        valid = [
+            (content_hash, article_id, text)
+            for content_hash, article_id, text
+            in zip(df[HASH_COLUMN], df["article_id"], df[field])
+            if isinstance(text, str) and text.strip() != ""
+        ]
+
+        docs = pipe_windows(
+            [text for _, _, text in valid],
+            batch_size=batch_size,
+            n_process=n_process,
+            **window_kw
+        )
+        for i, doc in docs:
+            content_hash, article_id, _ = valid[i]
+            yield content_hash, field, doc, article_id
+
+
+def entities_from_docs(records):
+    """
+    Flatten (content_hash, field, doc, article_id) records into
+    the columnar entity table (see ENTITY_COLUMNS).
+    """
+    columns = {col: [] for col in ENTITY_COLUMNS}
+
+    for _, field, doc, article_id in records:
+        for ent, start_char, end_char in owned_entities(doc):
+            columns["article_id"].append(article_id)
+            columns["field"].append(field)
+            columns["label"].append(ent.label_)
+            columns["text"].append(ent.text)
+            columns["start_char"].append(start_char)
+            columns["end_char"].append(end_char)
+
+    return pd.DataFrame(columns, columns=ENTITY_COLUMNS)
+
+
+def extract_entities(df, batch_size=BATCH_SIZE, n_process=N_PROCESS, **window_kw):
+    """
+    Parse df and return all entities as a columnar DataFrame.
+    """
+    return entities_from_docs(parse_fields(df, batch_size, n_process, **window_kw))
+
+
+def cached_records(df, cache_dir=DOC_CACHE_DIR, config=None):
+    """
+    Same records as parse_fields(), streamed from the DocBin cache
+    instead of running the model. Articles sharing one content_hash
+    reuse the same cached docs.
+    """
+    ids_by_hash = df.groupby(HASH_COLUMN)["article_id"].apply(list).to_dict()
+
+    docs = iter_docs(get_nlp().vocab, cache_dir, hashes=set(ids_by_hash),
+                     config=config if config is not None else window_config())
+    for content_hash, field, doc in docs:
+        for article_id in ids_by_hash[content_hash]:
+            yield content_hash, field, doc, article_id
+
+
+def entity_table_covers(df, path=ENTITIES_PATH):
+    """
+    True for rows of df whose current content (article_id +
+    content_hash) is in the entity table; False → the table is
+    missing, stale or predates the article, so NER must run for it.
+    """
+    add_content_hash(df)
+    if not Path(path).exists():
+        return pd.Series(False, index=df.index)
+    return ~changed_mask(df, load_previous(fingerprint_path(path)))
+
+
+def load_entities(path=ENTITIES_PATH, labels=None, article_ids=None):
+    """
+    Load the entity table, optionally filtered by label / article.
+    """
+    entities = pd.read_csv(path, keep_default_na=False, na_values=[""])
+    if labels is not None:
+        entities = entities[entities["label"].isin(labels)]
+    if article_ids is not None:
+        entities = entities[entities["article_id"].isin(article_ids)]
+    return entities
+
+
+# -----------------------------
+# Main pipeline
+# -----------------------------
+def main(incremental=True, batch_size=BATCH_SIZE, n_process=N_PROCESS,
+         use_doc_cache=True, dedup=True):
+    print("🔎 Running shared NER pass (Heading + Article)...")
+
+    df = pd.read_csv("data/processed/news_cleaned.csv")
+
+    required_cols = ["article_id", *ENTITY_FIELDS]
+    for col in required_cols:
+        if col not in df.columns:
+            raise ValueError(f"{col} column missing. Run text_cleaning first.")
+
+    # ♻️ Only parse new / changed articles (fingerprints in a sidecar)
+    add_content_hash(df)
+    previous = None
+    if incremental and ENTITIES_PATH.exists():
+        previous = load_previous(fingerprint_path(ENTITIES_PATH))
+    changed = changed_mask(df, previous)
+
+    delta = df[changed]
+
+    # 🪞 Duplicates (see deduplication.py) are parsed once via their
+    # representative, entity rows are copied to the other copies
+    mapping = load_canonical_map() if dedup else None
+    if dedup:
+        full_delta, delta = delta, representatives(delta, mapping)
+        record_savings("entity_extraction", len(full_delta), len(delta))
+
+    if use_doc_cache:
+        # 💾 Parsed docs come back from the DocBin cache; only
+        # content never seen before goes through the model
+        config = window_config()
+        in_cache = delta[HASH_COLUMN].isin(cached_hashes(config=config))
+        to_parse = delta[~in_cache]
+
+        entities = pd.concat([
+            entities_from_docs(cached_records(delta[in_cache], config=config)),
+            entities_from_docs(write_through(
+                parse_fields(to_parse, batch_size=batch_size, n_process=n_process),
+                config=config
+            )),
+        ])
+        print(f"💾 Doc cache: {int(in_cache.sum())} articles loaded, "
+              f"{len(to_parse)} parsed")
+    else:
+        entities = extract_entities(
+            delta, batch_size=batch_size, n_process=n_process
+        )
+
+    if dedup:
+        entities = fan_out_rows(entities, full_delta, mapping)
+
+    if previous is not None:
+        unchanged_ids = df.loc[~changed, "article_id"]
+        entities = pd.concat([
+            load_entities(article_ids=unchanged_ids),
+            entities
+        ])
+
+    # Stable layout: article → field → position in text
+    # (empty frames in the concats above can turn ints into floats)
+    entities = entities.astype({"article_id": int, "start_char": int, "end_char": int})
+    entities["field"] = pd.Categorical(entities["field"], categories=ENTITY_FIELDS)
+    entities = entities.sort_values(["article_id", "field", "start_char"], kind="stable")
+
+    entities.to_csv(ENTITIES_PATH, index=False)
+    df[["article_id", HASH_COLUMN]].to_csv(fingerprint_path(ENTITIES_PATH), index=False)
+
+    print(f"♻️ Incremental: reused {int((~changed).sum())}, "
+          f"re-extracted {int(changed.sum())} articles")
+    print(f"✅ {len(entities)} entities saved to {ENTITIES_PATH}")
+    print(entities["label"].value_counts().head(10))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ Key Principles:
 ✔ article_id is the single source of truth
 ✔ One row = One article
 ✔ INNER JOIN everywhere (safe joins)
+✔ Optional stages (recycled narratives) default to "Normal"
+  when their output is missing
 
 Output:
 data/processed/full_feature_set.csv
@@ -26,13 +28,49 @@ def main():
     # --------------------------------------------------
     # 1️⃣ Load all processed feature files
     # --------------------------------------------------
+    # Feature files carry every upstream column (full article text
+    # included) → read only the columns merged below
     cleaned_df = pd.read_csv(base_path / "news_cleaned.csv")
-    location_df = pd.read_csv(base_path / "news_with_location.csv")
-    sentiment_df = pd.read_csv(base_path / "news_with_sentiment.csv")
-    topic_df = pd.read_csv(base_path / "news_with_topics.csv")
-    temporal_df = pd.read_csv(base_path / "news_with_temporal_features.csv")
-    linguistic_df = pd.read_csv(base_path / "anomaly_scores.csv")
-    temporal_anomaly_df = pd.read_csv(base_path / "news_with_temporal_anomaly.csv")
+    location_df = pd.read_csv(
+        base_path / "news_with_location.csv",
+        usecols=["article_id", "claimed_location", "content_location", "location_anomaly"]
+    )
+    sentiment_df = pd.read_csv(
+        base_path / "news_with_sentiment.csv",
+        usecols=["article_id", "sentiment_positive", "sentiment_negative",
+                 "sentiment_neutral", "sentiment_label"]
+    )
+    topic_df = pd.read_csv(
+        base_path / "news_with_topics.csv",
+        usecols=["article_id", "topic_id", "topic_keywords"]
+    )
+    temporal_df = pd.read_csv(
+        base_path / "news_with_temporal_features.csv",
+        usecols=["article_id", "year", "month", "day", "weekday_name"]
+    )
+    linguistic_df = pd.read_csv(
+        base_path / "anomaly_scores.csv",
+        usecols=["article_id", "is_anomaly"]
+    )
+    temporal_anomaly_df = pd.read_csv(
+        base_path / "news_with_temporal_anomaly.csv",
+        usecols=["article_id", "temporal_anomaly"]
+    )
+    recycled_path = base_path / "news_with_recycled_anomaly.csv"
+    if recycled_path.exists():
+        recycled_df = pd.read_csv(
+            recycled_path,
+            usecols=["article_id", "dup_cluster_id", "dup_cluster_size", "recycled_anomaly"]
+        )
+    else:
+        # near_duplicates / recycled_anomaly skipped → every article is its own cluster
+        print(f"⚠️ {recycled_path} missing → recycled_anomaly = Normal")
+        recycled_df = pd.DataFrame({
+            "article_id": cleaned_df["article_id"],
+            "dup_cluster_id": cleaned_df["article_id"],
+            "dup_cluster_size": 1,
+            "recycled_anomaly": "Normal",
+        })
 
     print(f"✔ Base articles loaded: {len(cleaned_df)}")
 
@@ -122,6 +160,20 @@ def main():
         how="inner"
     )
 
+    # -------- Recycled Narratives (near-duplicates) --------
+    df = df.merge(
+        recycled_df[
+            [
+                "article_id",
+                "dup_cluster_id",
+                "dup_cluster_size",
+                "recycled_anomaly"
+            ]
+        ],
+        on="article_id",
+        how="inner"
+    )
+
     # --------------------------------------------------
     # 3️⃣ Final sanity check
     # --------------------------------------------------
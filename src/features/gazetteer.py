@@ -0,0 +1,167 @@
+"""
+gazetteer.py
+------------
+Purpose:
+Find every city / country / region mention in a text in ONE
+linear scan, using an Aho-Corasick automaton built once from a
+local gazetteer:
+- GeoText's bundled geonames data (cities15000 + countryInfo)
+- location_cleaning.LOCATION_ALIASES (US, U.K., UAE, ...)
+- location_cleaning.REGIONS (Asia, Middle East, ...)
+
+Used as the NER fallback in location_extraction and as a
+standalone fast mode that skips spaCy entirely.
+
+Matching rules (same spirit as GeoText):
+✔ Whole words only
+✔ Mention must start with a capital letter
+✔ Short aliases (US, UK, UAE) must be fully upper-case
+✔ Overlaps resolved leftmost-longest ("New York City" > "York")
+"""
+
+from functools import lru_cache
+from geotext import GeoText
+
+from src.features.location_cleaning import LOCATION_ALIASES, REGIONS
+
+CITY = "CITY"
+COUNTRY = "COUNTRY"
+REGION = "REGION"
+ALIAS = "ALIAS"
+
+
+# -----------------------------
+# Aho-Corasick automaton
+# -----------------------------
+class Gazetteer:
+    """
+    Multi-pattern matcher over lower-cased names.
+    `entries` maps lower-case name → kind (CITY / COUNTRY / ...).
+    """
+
+    def __init__(self, entries):
+        self.goto = [{}]     # state → {char: next state}
+        self.fail = [0]      # state → failure link
+        self.output = [[]]   # state → [(pattern length, kind)]
+
+        for name, kind in entries.items():
+            self._add(name, kind)
+        self._link()
+
+    def _add(self, name, kind):
+        state = 0
+        for ch in name:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = nxt
+        self.output[state].append((len(name), kind))
+
+    def _link(self):
+        # Breadth-first: failure links + merged outputs
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def find_all(self, text):
+        """
+        All location mentions as (start, end, kind), left to right,
+        non-overlapping (leftmost-longest wins).
+        """
+        if not isinstance(text, str) or not text:
+            return []
+
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few Unicode chars change length when lower-cased
+            lowered = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+        goto, fail, output = self.goto, self.fail, self.output
+        candidates = []
+        state = 0
+
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            for length, kind in output[state]:
+                start, end = i - length + 1, i + 1
+                if is_valid_mention(text, start, end, kind):
+                    candidates.append((start, end, kind))
+
+        # Leftmost-longest, non-overlapping
+        candidates.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        mentions = []
+        last_end = 0
+        for start, end, kind in candidates:
+            if start >= last_end:
+                mentions.append((start, end, kind))
+                last_end = end
+        return mentions
+
+    def first_location(self, text):
+        """
+        GeoText-style pick: first city, else first country / region.
+        Returns the mention as written in text, or "Unknown".
+        """
+        mentions = self.find_all(text)
+        for start, end, kind in mentions:
+            if kind == CITY:
+                return text[start:end]
+        if mentions:
+            start, end, _ = mentions[0]
+            return text[start:end]
+        return "Unknown"
+
+
+def is_valid_mention(text, start, end, kind):
+    # Whole words only
+    if start > 0 and text[start - 1].isalnum():
+        return False
+    if end < len(text) and text[end].isalnum():
+        return False
+
+    # Capitalised like a proper noun (GeoText rule)
+    if not text[start].isupper():
+        return False
+
+    # "US" yes, "us" / "Us" no
+    if kind == ALIAS:
+        return text[start:end].isupper()
+
+    return True
+
+
+# -----------------------------
+# Built once per process
+# -----------------------------
+def gazetteer_entries():
+    """
+    lower-case name → kind for the whole local gazetteer.
+    """
+    entries = {}
+    for name in GeoText.index.cities:
+        entries[name] = CITY
+    for name in GeoText.index.countries:
+        entries[name] = COUNTRY    # country names are not cities
+    for name in REGIONS:
+        entries[name] = REGION
+    for name in LOCATION_ALIASES:
+        entries[name] = ALIAS
+    return entries
+
+
+@lru_cache(maxsize=1)
+def get_gazetteer():
+    return Gazetteer(gazetteer_entries())
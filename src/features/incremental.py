@@ -0,0 +1,134 @@
+"""
+incremental.py
+--------------
+Purpose:
+Content fingerprints for incremental (delta-only) recompute.
+
+Every stage keeps a content_hash (hash of Heading + Article)
+next to its output. On a rerun, only articles whose hash is new
+or changed are recomputed; everything else is copied from the
+previous output of that stage.
+
+Key Principles:
+✔ article_id + content_hash identify one version of an article
+✔ Stages stay correct when the previous output is missing
+✔ Output row order always follows the current input
+"""
+
+import hashlib
+import pandas as pd
+from pathlib import Path
+
+HASH_COLUMN = "content_hash"
+
+
+# -------------------------------
+# Fingerprints
+# -------------------------------
+def content_fingerprint(heading, article):
+    """
+    Stable hash of one article's content (Heading + Article).
+    """
+    heading = heading if isinstance(heading, str) else ""
+    article = article if isinstance(article, str) else ""
+    payload = f"{heading}\x1f{article}".encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+def add_content_hash(df):
+    """
+    Add the content_hash column (in place) if it is not there yet.
+    """
+    if HASH_COLUMN not in df.columns:
+        headings = df["Heading"] if "Heading" in df.columns else [None] * len(df)
+        articles = df["Article"] if "Article" in df.columns else [None] * len(df)
+        df[HASH_COLUMN] = [
+            content_fingerprint(h, a) for h, a in zip(headings, articles)
+        ]
+    return df
+
+
+def fingerprint_path(output_path):
+    """
+    Sidecar file holding fingerprints for outputs that are not
+    one row per article (e.g. article_brands.csv).
+    """
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.fingerprints.csv")
+
+
+# -------------------------------
+# Previous outputs
+# -------------------------------
+def load_previous(path, columns=()):
+    """
+    Load article_id + content_hash (+ columns) from a previous
+    stage output. Returns None if it cannot be reused.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    wanted = ["article_id", HASH_COLUMN, *columns]
+    header = pd.read_csv(path, nrows=0).columns
+    if not set(wanted).issubset(header):
+        return None
+
+    previous = pd.read_csv(path, usecols=wanted)
+    return previous.drop_duplicates("article_id", keep="last")
+
+
+def changed_mask(df, previous):
+    """
+    True for rows of df that are new or whose content changed.
+    """
+    if previous is None:
+        return pd.Series(True, index=df.index)
+
+    known = pd.MultiIndex.from_frame(previous[["article_id", HASH_COLUMN]])
+    current = pd.MultiIndex.from_frame(df[["article_id", HASH_COLUMN]])
+    return pd.Series(~current.isin(known), index=df.index)
+
+
+# -------------------------------
+# Row-wise stages
+# -------------------------------
+def incremental_apply(df, output_path, columns, compute_fn):
+    """
+    Fill `columns` of df, recomputing only new / changed articles.
+
+    compute_fn(delta_df) must return a DataFrame with `columns`
+    and the same index as delta_df. Unchanged articles reuse the
+    values stored in output_path by the previous run.
+    """
+    columns = list(columns)
+    add_content_hash(df)
+
+    previous = load_previous(output_path, columns)
+    changed = changed_mask(df, previous)
+
+    parts = []
+    if previous is not None and (~changed).any():
+        # Left merge keeps row order, so the index can be restored as-is
+        reused = df.loc[~changed, ["article_id", HASH_COLUMN]].merge(
+            previous, on=["article_id", HASH_COLUMN], how="left"
+        )
+        reused.index = df.index[~changed]
+        parts.append(reused[columns])
+
+    if changed.any():
+        computed = compute_fn(df.loc[changed])
+        parts.append(computed[columns])
+
+    if parts:
+        result = pd.concat(parts).loc[df.index]
+        for col in columns:
+            df[col] = result[col]
+    else:
+        for col in columns:
+            df[col] = pd.Series(dtype=object)
+
+    print(f"♻️ Incremental: reused {int((~changed).sum())}, "
+          f"recomputed {int(changed.sum())} articles")
+
+    return df
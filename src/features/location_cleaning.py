@@ -23,6 +23,16 @@ REGIONS = {
     "north america", "africa", "latin america"
 }
 
+# Short forms → canonical country (used by normalize_location)
+LOCATION_ALIASES = {
+    "us": "United States",
+    "usa": "United States",
+    "u.s.": "United States",
+    "uk": "United Kingdom",
+    "u.k.": "United Kingdom",
+    "uae": "United Arab Emirates",
+}
+
 
 # ---------------------------
 # Core cleaner
@@ -1,11 +1,25 @@
 import pandas as pd
-import spacy
-from geotext import GeoText
 
-# -----------------------------
-# Load SpaCy NER model
-# -----------------------------
-nlp = spacy.load("en_core_web_sm")
+# Shared NER-only SpaCy model + entity table
+from src.features.entity_extraction import (
+    BATCH_SIZE,
+    ENTITIES_PATH,
+    N_PROCESS,
+    entity_table_covers,
+    get_nlp,
+    head_window,
+    load_entities,
+)
+from src.features.dict_encoding import map_unique, map_unique_rows
+from src.features.gazetteer import get_gazetteer
+from src.features.incremental import incremental_apply
+from src.features.location_cleaning import LOCATION_ALIASES
+
+LOCATION_LABELS = ("GPE", "LOC")
+
+# Only the start of a text is searched for its location
+# (caps NER cost on very long articles; None = whole text)
+LOCATION_MAX_CHARS = 2000
 
 
 # -----------------------------
@@ -15,25 +29,95 @@ def extract_location(text):
     """
     Extract first meaningful location from text using:
     1. SpaCy NER (GPE / LOC)
-    2. GeoText fallback
+    2. Gazetteer fallback (Aho-Corasick, see gazetteer.py)
     """
     if not isinstance(text, str) or text.strip() == "":
         return "Unknown"
 
+    text = head_window(text, LOCATION_MAX_CHARS)
+    return first_location(get_nlp()(text), text)
+
+
+def extract_locations(texts, batch_size=BATCH_SIZE, n_process=N_PROCESS,
+                      max_chars=LOCATION_MAX_CHARS):
+    """
+    Batched extract_location() built on nlp.pipe.
+    Returns one location per input text, in input order.
+    """
+    texts = list(texts)
+    results = ["Unknown"] * len(texts)
+
+    # Empty / missing texts stay "Unknown" and never reach spaCy
+    valid = [
+        (i, head_window(t, max_chars)) for i, t in enumerate(texts)
+        if isinstance(t, str) and t.strip() != ""
+    ]
+
+    docs = get_nlp().pipe(
+        (t for _, t in valid),
+        batch_size=batch_size,
+        n_process=n_process
+    )
+    for (i, text), doc in zip(valid, docs):
+        results[i] = first_location(doc, text)
+
+    return results
+
+
+def first_location(doc, text):
+    """
+    First GPE / LOC entity of a parsed doc, else gazetteer fallback.
+    """
     # SpaCy NER
-    doc = nlp(text)
     for ent in doc.ents:
-        if ent.label_ in ("GPE", "LOC"):
+        if ent.label_ in LOCATION_LABELS:
             return ent.text
 
-    # GeoText fallback
-    geo = GeoText(text)
-    if geo.cities:
-        return geo.cities[0]
-    if geo.countries:
-        return geo.countries[0]
+    return gazetteer_fallback(text)
+
+
+def locations_from_entities(df, entities, field, max_chars=LOCATION_MAX_CHARS):
+    """
+    Same rule as extract_locations(), read from the shared entity
+    table: first GPE / LOC in the head_window() of `field` per
+    article, else gazetteer fallback on that window.
+    """
+    windows = pd.Series([
+        head_window(t, max_chars) if isinstance(t, str) else t
+        for t in df[field]
+    ], index=df.index)
+    limit = pd.Series(
+        windows.str.len().to_numpy(), index=df["article_id"].to_numpy()
+    )
+    limit = limit[~limit.index.duplicated()]
+
+    hits = entities[
+        (entities["field"] == field) &
+        entities["label"].isin(LOCATION_LABELS)
+    ]
+    hits = (
+        hits[hits["end_char"] <= hits["article_id"].map(limit)]
+        .sort_values(["article_id", "start_char"])
+        .drop_duplicates("article_id")
+        .set_index("article_id")["text"]
+    )
+
+    found = df["article_id"].map(hits)
+    return [
+        loc if isinstance(loc, str) else gazetteer_fallback(text)
+        for loc, text in zip(found, windows)
+    ]
+
+
+def gazetteer_fallback(text):
+    """
+    First city, else first country / region in the gazetteer.
+    One linear scan; the automaton is built once per process.
+    """
+    if not isinstance(text, str) or text.strip() == "":
+        return "Unknown"
 
-    return "Unknown"
+    return get_gazetteer().first_location(text)
 
 
 # -----------------------------
@@ -49,16 +133,7 @@ def normalize_location(loc):
 
     loc = loc.lower()
 
-    mappings = {
-        "us": "United States",
-        "usa": "United States",
-        "u.s.": "United States",
-        "uk": "United Kingdom",
-        "u.k.": "United Kingdom",
-        "uae": "United Arab Emirates",
-    }
-
-    for key, value in mappings.items():
+    for key, value in LOCATION_ALIASES.items():
         if key in loc:
             return value
 
@@ -94,41 +169,103 @@ def detect_location_anomaly(claimed, content):
 # -----------------------------
 # MAIN PIPELINE
 # -----------------------------
-def main():
+LOCATION_COLUMNS = ["claimed_location", "content_location", "location_anomaly"]
+
+
+def extract_location_columns(df, batch_size=BATCH_SIZE, n_process=N_PROCESS,
+                             entities=None, mode="ner"):
+    """
+    Claimed / content location + anomaly label for a batch of articles.
+
+    mode="gazetteer" skips spaCy entirely: one gazetteer scan of the
+    raw Heading and Article (fast mode for high-volume ingestion).
+    With an entity table (see entity_extraction) this is a pure filter
+    for the articles it covers: claimed ← Heading entities, content ←
+    Article entities. Everything else (no table, or articles missing /
+    stale in it) runs NER here on Heading and Article. Both paths read
+    the raw text, limited to its first LOCATION_MAX_CHARS.
+    """
+    out = pd.DataFrame(index=df.index, columns=["claimed_location", "content_location"])
+
+    if mode == "gazetteer":
+        out["claimed_location"] = df["Heading"].apply(gazetteer_fallback)
+        out["content_location"] = df["Article"].apply(gazetteer_fallback)
+    else:
+        covered = pd.Series(False, index=df.index)
+        if entities is not None:
+            covered = entity_table_covers(df)
+            out.loc[covered, "claimed_location"] = locations_from_entities(df[covered], entities, "Heading")
+            out.loc[covered, "content_location"] = locations_from_entities(df[covered], entities, "Article")
+
+            if (~covered).any():
+                print(f"⚠️ {int((~covered).sum())} articles missing or stale in "
+                      f"{ENTITIES_PATH} → running NER on them")
+
+        todo = df[~covered]
+        if len(todo):
+            out.loc[~covered, "claimed_location"] = extract_locations(
+                todo["Heading"], batch_size=batch_size, n_process=n_process
+            )
+            out.loc[~covered, "content_location"] = extract_locations(
+                todo["Article"], batch_size=batch_size, n_process=n_process
+            )
+
+    # Normalize (once per distinct location)
+    out["claimed_location"] = map_unique(out["claimed_location"], normalize_location)
+    out["content_location"] = map_unique(out["content_location"], normalize_location)
+
+    # Anomaly rule, once per distinct (claimed, content) pair
+    out["location_anomaly"] = map_unique_rows(
+        out[["claimed_location", "content_location"]],
+        detect_location_anomaly
+    )
+    return out
+
+
+def main(incremental=True, batch_size=BATCH_SIZE, n_process=N_PROCESS,
+         use_entities=True, mode="ner"):
+    """
+    mode="ner"       → spaCy entities (+ gazetteer fallback)
+    mode="gazetteer" → gazetteer only, no spaCy
+    (use incremental=False when switching modes, and once after
+    upgrading from outputs that searched clean_text)
+    """
     print("📍 Running correct location extraction (claim vs content)...")
 
     # Load cleaned data
     df = pd.read_csv("data/processed/news_cleaned.csv")
 
-    required_cols = ["article_id", "Heading", "clean_text"]
+    required_cols = ["article_id", "Heading", "Article"]
     for col in required_cols:
         if col not in df.columns:
             raise ValueError(f"{col} column missing. Run text_cleaning first.")
 
+    output_path = "data/processed/news_with_location.csv"
+
     # -----------------------------
-    # Extract locations
+    # Extract locations + detect anomalies
+    # (only new / changed articles when incremental)
     # -----------------------------
-    df["claimed_location"] = df["Heading"].apply(extract_location)
-    df["content_location"] = df["clean_text"].apply(extract_location)
+    # Reuse the shared NER pass when it has been run
+    entities = None
+    if mode == "ner" and use_entities and ENTITIES_PATH.exists():
+        entities = load_entities(labels=LOCATION_LABELS)
+        print(f"✔ Using entity table: {ENTITIES_PATH}")
 
-    # Normalize
-    df["claimed_location"] = df["claimed_location"].apply(normalize_location)
-    df["content_location"] = df["content_location"].apply(normalize_location)
+    def extract_delta(delta):
+        return extract_location_columns(
+            delta, batch_size=batch_size, n_process=n_process,
+            entities=entities, mode=mode
+        )
 
-    # -----------------------------
-    # Detect anomalies
-    # -----------------------------
-    df["location_anomaly"] = df.apply(
-        lambda x: detect_location_anomaly(
-            x["claimed_location"], x["content_location"]
-        ),
-        axis=1
-    )
+    if incremental:
+        df = incremental_apply(df, output_path, LOCATION_COLUMNS, extract_delta)
+    else:
+        df[LOCATION_COLUMNS] = extract_delta(df)
 
     # -----------------------------
     # Save output
     # -----------------------------
-    output_path = "data/processed/news_with_location.csv"
     df.to_csv(output_path, index=False)
 
     print("✅ Location extraction completed")
@@ -0,0 +1,203 @@
+"""
+near_duplicates.py
+------------------
+Purpose:
+Find near-duplicate articles (wire copies, re-posts, lightly
+edited recycled stories) in near-linear time, and give every
+article a duplicate-cluster id + cluster size.
+
+Method:
+1. Word shingles of clean_text (SHINGLE_SIZE words each)
+2. MinHash signature per article (NUM_PERM hash functions)
+3. LSH banding: articles sharing any band land in one bucket
+4. Candidates confirmed by estimated Jaccard similarity
+   (optionally also by embedding cosine)
+5. Union-find → clusters
+
+Key Principles:
+✔ Near-linear: each bucket member is only compared to the
+  bucket's first member (union-find links the rest)
+✔ Deterministic: shingles hashed with crc32, seeded permutations
+✔ Cluster id = smallest article_id in the cluster
+
+Input:
+data/processed/news_cleaned.csv
+
+Output:
+data/processed/near_duplicates.csv
+    article_id, dup_cluster_id, dup_cluster_size
+"""
+
+import zlib
+import numpy as np
+import pandas as pd
+from collections import defaultdict
+from pathlib import Path
+
+from src.features.embedding_store import embeddings_for
+
+INPUT_PATH = Path("data/processed/news_cleaned.csv")
+OUTPUT_PATH = Path("data/processed/near_duplicates.csv")
+
+SHINGLE_SIZE = 5
+
+# 16 bands × 8 rows: pairs above ~0.7 Jaccard are very likely to
+# share a bucket, pairs below ~0.4 almost never do
+NUM_PERM = 128
+BANDS = 16
+
+# Estimated Jaccard needed to call two articles near-duplicates
+SIMILARITY_THRESHOLD = 0.8
+
+# Optional second check on the sentence embeddings
+EMBEDDING_THRESHOLD = 0.9
+
+SEED = 42
+
+# Universal hashing (a * x + b) mod p with p < 2^32 → no uint64 overflow
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+# -----------------------------
+# MinHash
+# -----------------------------
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """
+    crc32 of every `size`-word shingle (short texts → one shingle).
+    """
+    words = text.split() if isinstance(text, str) else []
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+
+    n = max(1, len(words) - size + 1)
+    shingles = {" ".join(words[i:i + size]) for i in range(n)}
+    return np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles)
+    ) % _PRIME
+
+
+def make_permutations(num_perm=NUM_PERM, seed=SEED):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signatures(texts, num_perm=NUM_PERM, seed=SEED):
+    """
+    (n, num_perm) MinHash matrix. Rows of empty texts stay at the
+    max value and are never matched.
+    """
+    a, b = make_permutations(num_perm, seed)
+    signatures = np.full((len(texts), num_perm), _PRIME, dtype=np.uint64)
+
+    for i, text in enumerate(texts):
+        hashes = shingle_hashes(text)
+        if len(hashes):
+            signatures[i] = ((a[:, None] * hashes[None, :] + b[:, None]) % _PRIME).min(axis=1)
+
+    return signatures
+
+
+# -----------------------------
+# LSH + clustering
+# -----------------------------
+class UnionFind:
+    def __init__(self, n):
+        self.parent = np.arange(n)
+
+    def find(self, i):
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:   # path compression
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i, j):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def candidate_pairs(signatures, bands=BANDS):
+    """
+    (anchor, member) pairs sharing at least one LSH band.
+    Each bucket yields len(bucket) - 1 pairs.
+    """
+    rows = signatures.shape[1] // bands
+    valid = signatures[:, 0] != _PRIME
+    pairs = set()
+
+    for band in range(bands):
+        buckets = defaultdict(list)
+        part = signatures[:, band * rows:(band + 1) * rows]
+        for i in np.flatnonzero(valid):
+            buckets[part[i].tobytes()].append(i)
+
+        for members in buckets.values():
+            anchor = members[0]
+            for other in members[1:]:
+                pairs.add((anchor, other))
+
+    return pairs
+
+
+def cluster_near_duplicates(texts, threshold=SIMILARITY_THRESHOLD,
+                            embeddings=None, embedding_threshold=EMBEDDING_THRESHOLD):
+    """
+    Cluster label (row position of the cluster root) per text.
+    """
+    texts = list(texts)
+    signatures = minhash_signatures(texts)
+    uf = UnionFind(len(texts))
+
+    if embeddings is not None:
+        norms = np.linalg.norm(embeddings, axis=1)
+
+    for i, j in candidate_pairs(signatures):
+        similarity = (signatures[i] == signatures[j]).mean()
+        if similarity < threshold:
+            continue
+        if embeddings is not None:
+            cosine = embeddings[i] @ embeddings[j] / (norms[i] * norms[j])
+            if cosine < embedding_threshold:
+                continue
+        uf.union(i, j)
+
+    return np.array([uf.find(i) for i in range(len(texts))])
+
+
+def main(threshold=SIMILARITY_THRESHOLD, use_embeddings=False):
+    print("🧬 Detecting near-duplicate articles (MinHash + LSH)...")
+
+    df = pd.read_csv(INPUT_PATH, usecols=["article_id", "clean_text"])
+
+    embeddings = None
+    if use_embeddings:
+        embeddings = embeddings_for(df["article_id"])
+
+    roots = cluster_near_duplicates(df["clean_text"], threshold, embeddings)
+
+    # Cluster id = smallest article_id among its members
+    article_ids = df["article_id"].to_numpy()
+    cluster_ids = pd.Series(article_ids).groupby(roots).transform("min")
+
+    result = pd.DataFrame({
+        "article_id": article_ids,
+        "dup_cluster_id": cluster_ids.to_numpy(),
+    })
+    result["dup_cluster_size"] = result.groupby("dup_cluster_id")["article_id"].transform("size")
+
+    result.to_csv(OUTPUT_PATH, index=False)
+
+    duplicated = result["dup_cluster_size"] > 1
+    print(f"✔ {int(duplicated.sum())} articles in "
+          f"{result.loc[duplicated, 'dup_cluster_id'].nunique()} near-duplicate clusters")
+    print(f"✅ Saved → {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+resources.py
+------------
+Purpose:
+Process-wide, lazy registry for every model / corpus the
+pipeline uses (spaCy, NLTK corpora, VADER, SentenceTransformer).
+
+Nothing is loaded at import time: importing a feature module
+(e.g. to reuse clean_text or extract_location) is near-instant
+and works offline. Each resource is loaded on first use, once
+per process, and its load time is recorded.
+
+Key Principles:
+✔ Lazy: loaded on first get_*() call, then reused
+✔ Offline: NLTK data and the sentence encoder are only looked
+  up locally, never downloaded implicitly
+✔ Missing data fails fast with the command that fixes it
+✔ Per-model load times via load_report()
+
+Setup (the ONLY step that touches the network):
+python -m src.features.resources
+"""
+
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+SPACY_MODEL = "en_core_web_sm"
+
+# SentenceTransformer used for topic embeddings, and the local copy
+# it is loaded from when present (written by `main()` below)
+SENTENCE_MODEL = "all-MiniLM-L6-v2"
+ENCODER_ROOT = Path("models/encoders")
+
+# "fp32" → stock PyTorch; "int8" → dynamic int8 quantization of
+# every Linear layer (CPU only, see benchmark_quantized_encoder)
+ENCODER_BACKENDS = ("fp32", "int8")
+
+# NLTK package → path checked by nltk.data.find
+NLTK_RESOURCES = {
+    "stopwords": "corpora/stopwords",
+    "wordnet": "corpora/wordnet",
+    "punkt_tab": "tokenizers/punkt_tab/english/",
+    "vader_lexicon": "sentiment/vader_lexicon.zip",
+}
+
+# resource name → load seconds (this process)
+LOAD_TIMES = {}
+
+
+def timed_load(name, loader):
+    """
+    Run loader(), record and print how long it took.
+    """
+    start = time.perf_counter()
+    resource = loader()
+    LOAD_TIMES[name] = time.perf_counter() - start
+    print(f"⏳ Loaded {name} in {LOAD_TIMES[name]:.2f}s")
+    return resource
+
+
+def load_report():
+    """
+    Load time of every resource loaded so far in this process.
+    """
+    report = pd.DataFrame(
+        list(LOAD_TIMES.items()), columns=["resource", "load_seconds"]
+    )
+    print(report)
+    return report
+
+
+# -----------------------------
+# NLTK
+# -----------------------------
+@lru_cache(maxsize=None)
+def require_nltk(package):
+    """
+    Check an NLTK package is installed locally (no network call).
+    """
+    import nltk
+
+    try:
+        nltk.data.find(NLTK_RESOURCES[package])
+    except LookupError:
+        raise LookupError(
+            f"NLTK resource '{package}' not found. "
+            "Run: python -m src.features.resources"
+        ) from None
+
+
+@lru_cache(maxsize=1)
+def get_stopwords():
+    def load():
+        require_nltk("stopwords")
+        from nltk.corpus import stopwords
+        return set(stopwords.words("english"))
+
+    return timed_load("nltk:stopwords", load)
+
+
+@lru_cache(maxsize=1)
+def get_lemmatizer():
+    def load():
+        require_nltk("wordnet")
+        from nltk.stem import WordNetLemmatizer
+        lemmatizer = WordNetLemmatizer()
+        lemmatizer.lemmatize("news")   # WordNet itself loads on first use
+        return lemmatizer
+
+    return timed_load("nltk:wordnet", load)
+
+
+@lru_cache(maxsize=1)
+def get_word_tokenize():
+    def load():
+        require_nltk("punkt_tab")
+        from nltk.tokenize import word_tokenize
+        return word_tokenize
+
+    return timed_load("nltk:punkt_tab", load)
+
+
+@lru_cache(maxsize=1)
+def get_vader():
+    def load():
+        require_nltk("vader_lexicon")
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        return SentimentIntensityAnalyzer()
+
+    return timed_load("nltk:vader", load)
+
+
+# -----------------------------
+# spaCy / SentenceTransformer
+# -----------------------------
+@lru_cache(maxsize=None)
+def get_spacy(model=SPACY_MODEL, exclude=()):
+    """
+    One spaCy pipeline per (model, excluded components).
+    `exclude` must be a tuple (it is part of the cache key).
+    """
+    def load():
+        import spacy
+        return spacy.load(model, exclude=list(exclude))
+
+    name = f"spacy:{model}" + (f" (exclude {', '.join(exclude)})" if exclude else "")
+    return timed_load(name, load)
+
+
+@lru_cache(maxsize=None)
+def get_sentence_transformer(model=SENTENCE_MODEL, backend="fp32"):
+    """
+    One encoder per (model, backend), loaded from the local copy
+    in models/encoders/<model> only (never from the hub).
+    """
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend: {backend}")
+
+    local = ENCODER_ROOT / model
+    if not local.exists():
+        raise LookupError(
+            f"Sentence encoder '{model}' not found in {ENCODER_ROOT}. "
+            "Run: python -m src.features.resources"
+        )
+
+    def load():
+        from sentence_transformers import SentenceTransformer
+
+        if backend == "int8":
+            # Quantized kernels are CPU only
+            return quantize_encoder(SentenceTransformer(str(local), device="cpu"))
+        return SentenceTransformer(str(local))
+
+    return timed_load(f"sentence_transformer:{model} ({backend})", load)
+
+
+def quantize_encoder(encoder):
+    """
+    Dynamic int8 quantization: Linear weights stored as int8,
+    activations quantized on the fly. No calibration data needed.
+    """
+    import torch
+
+    encoder.eval()
+    return torch.quantization.quantize_dynamic(encoder, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+# -----------------------------
+# One-off setup
+# -----------------------------
+def main(sentence_model=SENTENCE_MODEL):
+    """
+    Download every NLTK package the pipeline needs and save a
+    local copy of the sentence encoder.
+    """
+    import nltk
+    from sentence_transformers import SentenceTransformer
+
+    for package in NLTK_RESOURCES:
+        nltk.download(package)
+    print("✅ NLTK resources installed")
+
+    encoder_dir = ENCODER_ROOT / sentence_model
+    SentenceTransformer(sentence_model).save(str(encoder_dir))
+    print(f"✅ Encoder saved → {encoder_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+result_cache.py
+---------------
+Purpose:
+On-disk key-value cache for per-text model outputs
+(text hash → sentiment scores / embedding vector).
+
+Syndicated wire stories repeat the same clean_text many times,
+and reruns would otherwise re-score everything from scratch.
+sentiment_analysis and topic_modeling consult this cache before
+running VADER or the SentenceTransformer.
+
+Key Principles:
+✔ Key = hash of the exact text (+ namespace per model / stage)
+✔ Values are fixed-dtype numpy vectors
+✔ Size-bounded: least recently used entries are evicted
+✔ Hit rate is reported per run (data/processed/cache_stats.csv)
+
+Storage:
+data/cache/results.sqlite (SQLite from the standard library)
+"""
+
+import hashlib
+import sqlite3
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+CACHE_PATH = Path("data/cache/results.sqlite")
+STATS_PATH = Path("data/processed/cache_stats.csv")
+
+# Max entries kept per namespace (LRU eviction beyond this)
+MAX_ENTRIES = 1_000_000
+
+# SQLite limits the number of ? parameters per statement
+_QUERY_BATCH = 500
+
+
+def text_key(text):
+    """
+    Cache key for one text.
+    """
+    text = text if isinstance(text, str) else ""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    One namespace (e.g. "sentiment:vader") of the shared cache file.
+    """
+
+    def __init__(self, namespace, dtype, path=CACHE_PATH, max_entries=MAX_ENTRIES):
+        self.namespace = namespace
+        self.dtype = np.dtype(dtype)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " namespace TEXT, key TEXT, value BLOB, last_used INTEGER,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_lru ON entries (namespace, last_used)"
+        )
+
+    # -------------------------------
+    # Lookups
+    # -------------------------------
+    def get_many(self, keys):
+        """
+        {key: vector} for the keys found; hit stamps are refreshed.
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+
+        for i in range(0, len(keys), _QUERY_BATCH):
+            batch = keys[i:i + _QUERY_BATCH]
+            marks = ",".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT key, value FROM entries WHERE namespace = ? AND key IN ({marks})",
+                [self.namespace, *batch]
+            ).fetchall()
+            for key, value in rows:
+                found[key] = np.frombuffer(value, dtype=self.dtype)
+
+        if found:
+            now = time.time_ns()
+            self.conn.executemany(
+                "UPDATE entries SET last_used = ? WHERE namespace = ? AND key = ?",
+                [(now, self.namespace, key) for key in found]
+            )
+            self.conn.commit()
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """
+        Store {key: vector} and evict beyond max_entries.
+        """
+        now = time.time_ns()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+            [
+                (self.namespace, key, np.asarray(value, dtype=self.dtype).tobytes(), now)
+                for key, value in items.items()
+            ]
+        )
+        self.evict()
+        self.conn.commit()
+
+    def evict(self):
+        self.conn.execute(
+            "DELETE FROM entries WHERE namespace = ? AND key NOT IN ("
+            " SELECT key FROM entries WHERE namespace = ?"
+            " ORDER BY last_used DESC LIMIT ?)",
+            (self.namespace, self.namespace, self.max_entries)
+        )
+
+    # -------------------------------
+    # Reporting
+    # -------------------------------
+    def size(self):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+
+    def report(self, stats_path=STATS_PATH):
+        """
+        Print this run's hit rate and append it to the stats file.
+        """
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+
+        row = pd.DataFrame([{
+            "run_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(hit_rate, 4),
+            "entries": self.size(),
+        }])
+        stats_path = Path(stats_path)
+        stats_path.parent.mkdir(parents=True, exist_ok=True)
+        row.to_csv(stats_path, mode="a", header=not stats_path.exists(), index=False)
+
+        print(f"💾 Cache [{self.namespace}]: {self.hits} hits / "
+              f"{self.misses} misses ({hit_rate:.1%} hit rate)")
+
+    def close(self):
+        self.conn.close()
+
+
+def rename_namespace(old, new, path=CACHE_PATH):
+    """
+    Move entries of a renamed namespace; entries the new namespace
+    already has are dropped from the old one. No-op when empty.
+    """
+    path = Path(path)
+    if not path.exists():
+        return 0
+
+    conn = sqlite3.connect(path)
+    try:
+        moved = conn.execute(
+            "UPDATE OR IGNORE entries SET namespace = ? WHERE namespace = ?", (new, old)
+        ).rowcount
+        conn.execute("DELETE FROM entries WHERE namespace = ?", (old,))
+        conn.commit()
+    except sqlite3.OperationalError:   # no entries table yet
+        moved = 0
+    finally:
+        conn.close()
+
+    if moved:
+        print(f"💾 Cache: moved {moved} entries {old} → {new}")
+    return moved
+
+
+# -------------------------------
+# Cache-through helper
+# -------------------------------
+def cached_vectors(texts, cache, compute_fn):
+    """
+    One vector per text, in input order.
+
+    Texts found in the cache are reused; each distinct missing text
+    is computed once via compute_fn(list of texts) → 2-D array, then
+    stored. Pass cache=None to always compute.
+    """
+    texts = list(texts)
+    if cache is None:
+        return np.asarray(compute_fn(texts))
+
+    keys = [text_key(t) for t in texts]
+    found = cache.get_many(keys)
+
+    # First occurrence of every missing key
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+
+    if missing:
+        computed = np.asarray(compute_fn(list(missing.values())), dtype=cache.dtype)
+        fresh = dict(zip(missing, computed))
+        cache.put_many(fresh)
+        found.update(fresh)
+
+    if not keys:
+        return np.empty((0, 0), dtype=cache.dtype)
+    return np.vstack([found[key] for key in keys])
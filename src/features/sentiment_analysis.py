@@ -1,52 +1,188 @@
 #src/features/sentiment_analysis.py
+import os
+import numpy as np
 import pandas as pd
-from nltk.sentiment import SentimentIntensityAnalyzer
-import nltk
+from concurrent.futures import ProcessPoolExecutor
 
-# Download once
-nltk.download("vader_lexicon")
+from src.features.deduplication import dedup_apply
+from src.features.incremental import incremental_apply
+from src.features.resources import get_vader
+from src.features.result_cache import ResultCache, cached_vectors
 
+SENTIMENT_LABELS = ["Negative", "Neutral", "Positive"]
 
-def analyze_sentiment(text):
+# Process pool defaults for batched scoring; None = every core
+N_WORKERS = None
+CHUNK_SIZE = 512
+
+# Persistent text-hash → scores cache shared across runs
+USE_CACHE = True
+CACHE_NAMESPACE = "sentiment:vader"
+
+
+def get_analyzer():
     """
-    Returns sentiment scores using VADER
+    One VADER analyzer (and lexicon load) per process,
+    loaded lazily by the resource registry.
     """
-    if not isinstance(text, str) or text.strip() == "":
-        return pd.Series([0, 0, 0, "Neutral"])
-
-    sia = SentimentIntensityAnalyzer()
-    scores = sia.polarity_scores(text)
+    return get_vader()
 
-    compound = scores["compound"]
 
+def sentiment_label(compound):
     if compound >= 0.05:
-        label = "Positive"
+        return "Positive"
     elif compound <= -0.05:
-        label = "Negative"
+        return "Negative"
     else:
-        label = "Neutral"
+        return "Neutral"
+
+
+def analyze_sentiment(text):
+    """
+    Returns sentiment scores using VADER
+    """
+    if not isinstance(text, str) or text.strip() == "":
+        return pd.Series([0, 0, 0, "Neutral"])
+
+    scores = get_analyzer().polarity_scores(text)
 
     return pd.Series([
         scores["pos"],
         scores["neg"],
         scores["neu"],
-        label
+        sentiment_label(scores["compound"])
     ])
 
 
-def main():
+# -------------------------------
+# Batched scoring
+# -------------------------------
+def score_chunk(texts):
+    """
+    Score a list of texts in one worker.
+    Returns (float32 [pos, neg, neu, compound] array, label codes).
+    Labels are decided on the full-precision compound score.
+    """
+    analyzer = get_analyzer()
+    scores = np.zeros((len(texts), 4), dtype=np.float32)
+    codes = np.full(len(texts), SENTIMENT_LABELS.index("Neutral"), dtype=np.int8)
+
+    for i, text in enumerate(texts):
+        if not isinstance(text, str) or text.strip() == "":
+            continue   # 0, 0, 0 → Neutral (same as analyze_sentiment)
+
+        s = analyzer.polarity_scores(text)
+        scores[i] = (s["pos"], s["neg"], s["neu"], s["compound"])
+        codes[i] = SENTIMENT_LABELS.index(sentiment_label(s["compound"]))
+
+    return scores, codes
+
+
+def score_sentiments(texts, n_workers=N_WORKERS, chunk_size=CHUNK_SIZE):
+    """
+    Score many texts across a process pool.
+
+    Returns:
+    - scores: preallocated float32 array, columns pos / neg / neu / compound
+    - labels: pd.Categorical of Negative / Neutral / Positive
+    Results are in input order.
+    """
+    texts = list(texts)
+    scores = np.empty((len(texts), 4), dtype=np.float32)
+    codes = np.empty(len(texts), dtype=np.int8)
+
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    if n_workers <= 1 or len(chunks) <= 1:
+        results = map(score_chunk, chunks)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=n_workers)
+        results = executor.map(score_chunk, chunks)
+
+    try:
+        start = 0
+        for chunk_scores, chunk_codes in results:
+            end = start + len(chunk_codes)
+            scores[start:end] = chunk_scores
+            codes[start:end] = chunk_codes
+            start = end
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    labels = pd.Categorical.from_codes(codes, categories=SENTIMENT_LABELS)
+    return scores, labels
+
+
+SENTIMENT_COLUMNS = [
+    "sentiment_positive", "sentiment_negative", "sentiment_neutral",
+    "sentiment_compound", "sentiment_label"
+]
+
+
+def sentiment_columns(df, n_workers=N_WORKERS, chunk_size=CHUNK_SIZE, cache=None):
+    """
+    Sentiment scores + label for a batch of articles.
+    With a ResultCache, only texts not seen before are scored.
+    """
+    def score(texts):
+        scores, labels = score_sentiments(
+            texts, n_workers=n_workers, chunk_size=chunk_size
+        )
+        # Label code stored alongside the scores (exact in float32)
+        return np.column_stack([scores, labels.codes])
+
+    vectors = cached_vectors(df["clean_text"], cache, score)
+    if len(vectors) == 0:
+        vectors = np.zeros((0, 5), dtype=np.float32)
+
+    out = pd.DataFrame(
+        vectors[:, :4].astype(np.float32), columns=SENTIMENT_COLUMNS[:4], index=df.index
+    )
+    out["sentiment_label"] = pd.Categorical.from_codes(
+        vectors[:, 4].astype(np.int8), categories=SENTIMENT_LABELS
+    )
+    return out
+
+
+def main(incremental=True, n_workers=N_WORKERS, chunk_size=CHUNK_SIZE,
+         use_cache=USE_CACHE, dedup=True):
     print("😊 Running sentiment analysis...")
 
     df = pd.read_csv("data/processed/news_with_location.csv")
+    output_path = "data/processed/news_with_sentiment.csv"
 
     if "clean_text" not in df.columns:
         raise ValueError("clean_text column missing")
 
-    df[
-        ["sentiment_positive", "sentiment_negative", "sentiment_neutral", "sentiment_label"]
-    ] = df["clean_text"].apply(analyze_sentiment)
+    cache = ResultCache(CACHE_NAMESPACE, np.float32) if use_cache else None
+
+    def score_reps(reps):
+        return sentiment_columns(
+            reps, n_workers=n_workers, chunk_size=chunk_size, cache=cache
+        )
 
-    df.to_csv("data/processed/news_with_sentiment.csv", index=False)
+    # Duplicates (see deduplication.py) are scored once, then fanned out
+    def score_delta(delta):
+        if dedup:
+            return dedup_apply(delta, score_reps, "sentiment_analysis")
+        return score_reps(delta)
+
+    # Only new / changed articles are re-scored when incremental
+    if incremental:
+        df = incremental_apply(df, output_path, SENTIMENT_COLUMNS, score_delta)
+    else:
+        df[SENTIMENT_COLUMNS] = score_delta(df)
+
+    df.to_csv(output_path, index=False)
+
+    if cache is not None:
+        cache.report()
+        cache.close()
 
     print("✅ Sentiment analysis completed")
     print(df["sentiment_label"].value_counts())
@@ -54,4 +190,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
@@ -25,13 +25,14 @@ def main():
     input_path = Path("data/processed/news_with_topics.csv")
     output_path = Path("data/processed/topic_keywords.csv")
 
-    df = pd.read_csv(input_path)
-
     # Safety check
     required_cols = {"topic_id", "topic_keywords"}
-    if not required_cols.issubset(df.columns):
+    if not required_cols.issubset(pd.read_csv(input_path, nrows=0).columns):
         raise ValueError("topic_id or topic_keywords missing")
 
+    # Only the two columns needed (not the whole article table)
+    df = pd.read_csv(input_path, usecols=list(required_cols))
+
     # -------------------------------
     # One row per topic
     # -------------------------------
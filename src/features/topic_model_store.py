@@ -0,0 +1,135 @@
+"""
+topic_model_store.py
+--------------------
+Purpose:
+Persist the fitted BERTopic model so new articles can be mapped
+to EXISTING topics (transform) instead of refitting every run,
+and track drift to know when a full refit is due.
+
+Key Principles:
+✔ A full fit is a separate, scheduled operation (mode="fit")
+✔ Topic ids stay stable between refits → topic_keywords.csv
+  keeps meaning the same thing in the dashboard
+✔ Drift = outlier rate of articles assigned since the fit
+  minus the outlier rate of the fit itself
+✔ The embedding model is not pickled (reloaded via resources)
+
+Files:
+models/bertopic/model.pkl
+models/bertopic/state.json
+data/processed/topic_drift.csv   (one row per assign run)
+"""
+
+import json
+import pandas as pd
+from pathlib import Path
+
+MODEL_DIR = Path("models/bertopic")
+DRIFT_PATH = Path("data/processed/topic_drift.csv")
+
+# Refit once the outlier rate of newly assigned articles exceeds
+# the fit baseline by this much
+REFIT_DRIFT_THRESHOLD = 0.10
+
+
+def model_path(model_dir=MODEL_DIR):
+    return Path(model_dir) / "model.pkl"
+
+
+def state_path(model_dir=MODEL_DIR):
+    return Path(model_dir) / "state.json"
+
+
+def model_exists(model_dir=MODEL_DIR):
+    return model_path(model_dir).exists() and state_path(model_dir).exists()
+
+
+def outlier_rate(topics):
+    topics = pd.Series(topics)
+    return float((topics == -1).mean()) if len(topics) else 0.0
+
+
+# -----------------------------
+# Save / load
+# -----------------------------
+def save_topic_model(topic_model, topics, model_dir=MODEL_DIR):
+    """
+    Save a freshly fitted model + its baseline statistics.
+    """
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+
+    topic_model.save(
+        model_path(model_dir),
+        serialization="pickle",
+        save_embedding_model=False
+    )
+
+    state = {
+        "fitted_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "fit_documents": len(topics),
+        "fit_outlier_rate": outlier_rate(topics),
+        "assigned_documents": 0,
+        "assigned_outliers": 0,
+    }
+    save_state(state, model_dir)
+    print(f"✔ Topic model saved → {model_path(model_dir)}")
+    return state
+
+
+def load_topic_model(embedding_model, model_dir=MODEL_DIR):
+    from bertopic import BERTopic
+
+    return BERTopic.load(str(model_path(model_dir)), embedding_model=embedding_model)
+
+
+def load_state(model_dir=MODEL_DIR):
+    with open(state_path(model_dir)) as f:
+        return json.load(f)
+
+
+def save_state(state, model_dir=MODEL_DIR):
+    with open(state_path(model_dir), "w") as f:
+        json.dump(state, f, indent=2)
+
+
+# -----------------------------
+# Drift
+# -----------------------------
+def update_drift(new_topics, model_dir=MODEL_DIR, drift_path=DRIFT_PATH,
+                 threshold=REFIT_DRIFT_THRESHOLD):
+    """
+    Add this run's assignments to the running totals since the fit,
+    log the drift metric and say whether a refit is due.
+    """
+    state = load_state(model_dir)
+    state["assigned_documents"] += len(new_topics)
+    state["assigned_outliers"] += int((pd.Series(new_topics) == -1).sum())
+    save_state(state, model_dir)
+
+    assigned = state["assigned_documents"]
+    assigned_rate = state["assigned_outliers"] / assigned if assigned else 0.0
+    drift = assigned_rate - state["fit_outlier_rate"]
+    refit_due = assigned > 0 and drift > threshold
+
+    row = pd.DataFrame([{
+        "run_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "fitted_at": state["fitted_at"],
+        "new_documents": len(new_topics),
+        "assigned_since_fit": assigned,
+        "fit_outlier_rate": round(state["fit_outlier_rate"], 4),
+        "assigned_outlier_rate": round(assigned_rate, 4),
+        "drift": round(drift, 4),
+        "refit_due": refit_due,
+    }])
+    drift_path = Path(drift_path)
+    drift_path.parent.mkdir(parents=True, exist_ok=True)
+    row.to_csv(drift_path, mode="a", header=not drift_path.exists(), index=False)
+
+    print(f"📈 Topic drift: outlier rate {assigned_rate:.1%} since fit "
+          f"vs {state['fit_outlier_rate']:.1%} at fit ({drift:+.1%})")
+    if refit_due:
+        print("⚠️ Drift above threshold → schedule a full refit: "
+              "topic_modeling.main(mode=\"fit\")")
+
+    return drift, refit_due
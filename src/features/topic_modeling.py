@@ -1,13 +1,136 @@
+import os
+import time
+import numpy as np
 import pandas as pd
-from sentence_transformers import SentenceTransformer
-from bertopic import BERTopic
 
+from src.features.deduplication import dedup_apply
+from src.features.dict_encoding import map_unique
+from src.features.embedding_store import (
+    EMBEDDINGS_PATH,
+    incremental_embeddings,
+    save_embeddings,
+)
+from src.features.incremental import (
+    HASH_COLUMN,
+    add_content_hash,
+    changed_mask,
+    load_previous,
+)
+from src.features.resources import SENTENCE_MODEL, get_sentence_transformer
+from src.features.result_cache import ResultCache, cached_vectors, rename_namespace
+from src.features.topic_model_store import (
+    load_topic_model,
+    model_exists,
+    save_topic_model,
+    update_drift,
+)
 
-def main():
-    print("🧠 Running BERTopic modeling...")
+EMBEDDING_MODEL = SENTENCE_MODEL
+
+# "fp32" or "int8" (dynamic-quantized CPU encoder, see
+# benchmark_quantized_encoder). Vectors differ slightly between
+# backends, so stored / cached vectors are kept per backend.
+ENCODER_BACKEND = "fp32"
+
+# Persistent text-hash → embedding cache shared across runs
+USE_CACHE = True
+
+# Encoder batch size (SentenceTransformer.encode length-sorts the
+# texts itself → little padding per batch)
+ENCODE_BATCH_SIZE = 64
+
+TIMING_PATH = "data/evaluation/topic_modeling_timing.csv"
+
+OUTPUT_PATH = "data/processed/news_with_topics.csv"
+TOPIC_COLUMNS = ["topic_id", "topic_probability", "topic_keywords"]
+
+# "assign" maps new / changed articles to the saved model's topics;
+# "fit" is the (scheduled) full refit on the whole corpus
+TOPIC_MODE = "assign"
+
+# "assigned" → only the assigned topic's confidence (HDBSCAN membership
+#   strength, no documents × topics matrix); "full" → soft-membership
+#   matrix over every topic (calculate_probabilities=True), max kept
+#   (see src/evaluation/benchmark_topic_probabilities.py)
+PROBABILITY_MODE = "assigned"
+
+
+def encode_texts(model, texts, batch_size=ENCODE_BATCH_SIZE):
+    """
+    Encode texts in batches, vectors in input order. encode() already
+    batches by length internally; empty input gives a (0, dim) array.
+    """
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+    return model.encode(
+        texts,
+        batch_size=batch_size,
+        show_progress_bar=True,
+        convert_to_numpy=True
+    )
+
+
+def topic_confidence(probs):
+    """
+    Probability of the assigned topic per document
+    (row max of a full matrix, or the 1-D assigned-topic vector).
+    """
+    probs = np.asarray(probs)
+    return probs.max(axis=1) if probs.ndim == 2 else probs
+
+
+def topic_label(topic_model, topic_id):
+    if topic_id == -1:
+        return "Outlier"
+    return ", ".join([w for w, _ in topic_model.get_topic(topic_id)][:5])
+
+
+def assign_topics(df, documents, embeddings, topic_model, output_path=OUTPUT_PATH):
+    """
+    Reuse topics of unchanged articles from the previous output and
+    map only new / changed articles to the existing topics.
+    Returns the topic ids of the newly assigned articles.
+    """
+    add_content_hash(df)
+    previous = load_previous(output_path, TOPIC_COLUMNS[:2])
+    changed = changed_mask(df, previous).to_numpy()
+
+    if previous is not None and (~changed).any():
+        reused = df.loc[~changed, ["article_id", HASH_COLUMN]].merge(
+            previous, on=["article_id", HASH_COLUMN], how="left"
+        )
+        df.loc[~changed, "topic_id"] = reused["topic_id"].to_numpy()
+        df.loc[~changed, "topic_probability"] = reused["topic_probability"].to_numpy()
+
+    new_topics = []
+    if changed.any():
+        # Precomputed embeddings → transform does not re-encode
+        new_topics, probs = topic_model.transform(
+            [d for d, c in zip(documents, changed) if c], embeddings[changed]
+        )
+        df.loc[changed, "topic_id"] = new_topics
+        df.loc[changed, "topic_probability"] = topic_confidence(probs)
+
+    df["topic_id"] = df["topic_id"].astype(int)
+
+    print(f"♻️ Assign: reused {int((~changed).sum())}, "
+          f"assigned {int(changed.sum())} articles to existing topics")
+    return list(new_topics)
+
+
+def main(incremental=True, use_cache=USE_CACHE, batch_size=ENCODE_BATCH_SIZE,
+         mode=TOPIC_MODE, probability_mode=PROBABILITY_MODE,
+         encoder_backend=ENCODER_BACKEND, dedup=True):
+    print(f"🧠 Running BERTopic modeling (mode={mode})...")
+
+    if probability_mode not in ("assigned", "full"):
+        raise ValueError(f"Unknown probability mode: {probability_mode}")
 
     # Load data
     df = pd.read_csv("data/processed/news_with_sentiment.csv")
+    output_path = OUTPUT_PATH
 
     if "clean_text" not in df.columns:
         raise ValueError("clean_text column missing")
@@ -15,36 +138,130 @@ def main():
     documents = df["clean_text"].astype(str).tolist()
 
     # Load embedding model
-    embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+    embedding_model = get_sentence_transformer(EMBEDDING_MODEL, backend=encoder_backend)
 
-    # Initialize BERTopic
-    topic_model = BERTopic(
-        embedding_model=embedding_model,
-        calculate_probabilities=True,
-        verbose=True
-    )
+    # Vectors depend on the model + backend: both key the cache
+    # namespace and are stamped on the embedding store
+    encoder = f"{EMBEDDING_MODEL}:{encoder_backend}"
+    cache = None
+    if use_cache:
+        # Entries cached before the backend was part of the namespace are fp32
+        rename_namespace(f"embedding:{EMBEDDING_MODEL}", f"embedding:{EMBEDDING_MODEL}:fp32")
+        cache = ResultCache(f"embedding:{encoder}", np.float32)
+
+    encoded = 0
+
+    def encode(texts):
+        nonlocal encoded
+        encoded += len(texts)
+        return encode_texts(embedding_model, texts, batch_size=batch_size)
+
+    def encode_reps(reps):
+        return cached_vectors(reps["clean_text"].astype(str), cache, encode)
+
+    # Duplicates (see deduplication.py) are encoded once, then fanned out
+    def encode_delta(delta):
+        if dedup:
+            return dedup_apply(delta, encode_reps, "topic_modeling")
+        return encode_reps(delta)
+
+    # The ONLY encoder pass of this stage
+    start = time.perf_counter()
+    if incremental:
+        # Encode only new / changed articles; reuse stored vectors for the rest
+        embeddings = incremental_embeddings(
+            df, encode_delta, embedding_model.get_sentence_embedding_dimension(), encoder
+        )
+    else:
+        add_content_hash(df)
+        embeddings = np.asarray(encode_delta(df), dtype=np.float32)
+    encode_seconds = time.perf_counter() - start
+
+    if mode == "assign" and not model_exists():
+        print("⚠️ No saved topic model yet → running a full fit")
+        mode = "fit"
+
+    start = time.perf_counter()
+    if mode == "fit":
+        from bertopic import BERTopic   # heavy import, only needed to fit
 
-    # Fit model
-    topics, probs = topic_model.fit_transform(documents)
+        # Initialize BERTopic
+        topic_model = BERTopic(
+            embedding_model=embedding_model,
+            calculate_probabilities=(probability_mode == "full"),
+            verbose=True
+        )
+
+        # Fit model on the precomputed embeddings (BERTopic does not
+        # re-encode). Topic ids are corpus-wide, so the fit itself always
+        # covers every article — only the encoding is incremental.
+        topics, probs = topic_model.fit_transform(documents, embeddings)
+        df["topic_id"] = topics
+        df["topic_probability"] = topic_confidence(probs)
+
+        save_topic_model(topic_model, topics)
+    elif mode == "assign":
+        topic_model = load_topic_model(embedding_model)
+        new_topics = assign_topics(df, documents, embeddings, topic_model, output_path)
+        update_drift(new_topics)
+    else:
+        raise ValueError(f"Unknown topic mode: {mode}")
+    topic_seconds = time.perf_counter() - start
 
     # Assign topic info
-    df["topic_id"] = topics
-    df["topic_probability"] = probs.max(axis=1)
-    df["topic_keywords"] = df["topic_id"].apply(
-        lambda x: ", ".join([w for w, _ in topic_model.get_topic(x)][:5])
-        if x != -1 else "Outlier"
+    df["topic_keywords"] = map_unique(
+        df["topic_id"], lambda x: topic_label(topic_model, x)
     )
 
-    # Save embeddings for anomaly models
-    embeddings = embedding_model.encode(documents, show_progress_bar=True)
-    df["embedding"] = embeddings.tolist()
+    # Embeddings go to the binary store (not the CSV)
+    save_embeddings(df["article_id"], embeddings, df[HASH_COLUMN], encoder)
+    print(f"✔ Embeddings saved → {EMBEDDINGS_PATH}")
 
     # Save output
-    df.to_csv("data/processed/news_with_topics.csv", index=False)
+    df.drop(columns=["embedding"], errors="ignore").to_csv(output_path, index=False)
+
+    if cache is not None:
+        cache.report()
+        cache.close()
+
+    report_timing(mode, len(documents), encoded, encode_seconds, topic_seconds)
 
     print("✅ BERTopic modeling completed")
     print(df["topic_id"].value_counts().head())
 
 
+def report_timing(mode, n_documents, n_encoded, encode_seconds, topic_seconds):
+    """
+    Print and append this run's timings. estimated_saved_seconds is
+    not measured: this run's per-document encode time × the encoder
+    passes avoided (BERTopic encoding every document inside
+    fit_transform, plus re-encoding reused / cached texts).
+    """
+    per_doc = encode_seconds / n_encoded if n_encoded else 0.0
+    saved_seconds = per_doc * (n_documents + n_documents - n_encoded)
+
+    timing = pd.DataFrame([{
+        "mode": mode,
+        "documents": n_documents,
+        "encoded": n_encoded,
+        "encode_seconds": round(encode_seconds, 3),
+        "topic_seconds": round(topic_seconds, 3),
+        "estimated_saved_seconds": round(saved_seconds, 3),
+    }])
+    os.makedirs(os.path.dirname(TIMING_PATH), exist_ok=True)
+
+    # File started with other columns (older version) → set it aside
+    if os.path.exists(TIMING_PATH):
+        header = list(pd.read_csv(TIMING_PATH, nrows=0).columns)
+        if header != list(timing.columns):
+            stamp = pd.Timestamp.now().strftime("%Y%m%d%H%M%S")
+            os.replace(TIMING_PATH, TIMING_PATH.replace(".csv", f".{stamp}.csv"))
+
+    timing.to_csv(TIMING_PATH, mode="a", header=not os.path.exists(TIMING_PATH), index=False)
+
+    print(f"⏱️ Encoded {n_encoded}/{n_documents} documents in {encode_seconds:.1f}s, "
+          f"BERTopic {mode} {topic_seconds:.1f}s, ~{saved_seconds:.1f}s of encoding saved (estimated)")
+
+
 if __name__ == "__main__":
     main()
@@ -1,36 +1,161 @@
+"""
+umap_projection.py
+------------------
+Purpose:
+2-D semantic map of all articles for the dashboard.
+
+Modes:
+- "sample" (default): fit UMAP on a topic-stratified sample, save
+  the reducer, and place every other article with transform() in
+  bounded chunks. Later runs reuse the saved reducer, keep the
+  coordinates of unchanged articles and only place new ones →
+  the map stays stable across runs.
+- "full": the original fit_transform over every embedding.
+
+Input:
+embedding store (data/processed/embeddings.npy)
+data/processed/news_with_topics.csv (topic_id, for stratification)
+
+Output:
+data/processed/umap_embeddings.csv   article_id, x, y, content_hash
+models/umap_reducer.joblib
+"""
+
+import joblib
 import pandas as pd
 import numpy as np
 import umap
+from pathlib import Path
+
+from src.features.embedding_store import load_embeddings
+from src.features.incremental import HASH_COLUMN, changed_mask, load_previous
+
+OUTPUT_PATH = Path("data/processed/umap_embeddings.csv")
+TOPICS_PATH = Path("data/processed/news_with_topics.csv")
+REDUCER_PATH = Path("models/umap_reducer.joblib")
+
+UMAP_MODE = "sample"
 
-def main():
-    print("🔷 Running UMAP projection...")
+# Articles the reducer is fitted on; the rest go through transform()
+SAMPLE_SIZE = 20_000
 
-    df = pd.read_csv("data/processed/news_with_topics.csv")
+# Articles per transform() call (bounds peak memory)
+CHUNK_SIZE = 10_000
 
-    if "embedding" not in df.columns:
-        raise ValueError("Embedding column missing")
+SEED = 42
 
-    # Convert embedding list-string → numpy array
-    embeddings = np.vstack(df["embedding"].apply(eval).values)
 
-    reducer = umap.UMAP(
+def make_reducer():
+    return umap.UMAP(
         n_neighbors=15,
         min_dist=0.1,
         n_components=2,
-        random_state=42
+        random_state=SEED
     )
 
-    umap_embeddings = reducer.fit_transform(embeddings)
+
+def stratified_sample(labels, sample_size, seed=SEED):
+    """
+    Row positions of a sample with every label represented in
+    proportion (at least one row per label).
+    """
+    labels = pd.Series(labels).reset_index(drop=True)
+    if sample_size >= len(labels):
+        return np.arange(len(labels))
+
+    rng = np.random.default_rng(seed)
+    frac = sample_size / len(labels)
+
+    groups = labels.groupby(labels).indices
+    picked = []
+    for label in sorted(groups):
+        rows = groups[label]
+        k = min(len(rows), max(1, round(len(rows) * frac)))
+        picked.append(rng.choice(rows, size=k, replace=False))
+    return np.sort(np.concatenate(picked))
+
+
+def topic_labels(article_ids):
+    """
+    topic_id per article (-1 when unknown) for stratification.
+    """
+    if not TOPICS_PATH.exists():
+        return pd.Series(-1, index=range(len(article_ids)))
+
+    topics = pd.read_csv(TOPICS_PATH, usecols=["article_id", "topic_id"])
+    topics = topics.drop_duplicates("article_id").set_index("article_id")["topic_id"]
+    return pd.Series(article_ids).map(topics).fillna(-1).astype(int)
+
+
+def transform_in_chunks(reducer, matrix, rows, chunk_size=CHUNK_SIZE):
+    """
+    reducer.transform() over matrix[rows], chunk_size rows at a time.
+    """
+    coords = np.empty((len(rows), 2), dtype=np.float32)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        coords[start:start + len(chunk)] = reducer.transform(
+            np.asarray(matrix[chunk], dtype=np.float32)
+        )
+    return coords
+
+
+def main(mode=UMAP_MODE, refit=False, sample_size=SAMPLE_SIZE, chunk_size=CHUNK_SIZE):
+    print(f"🔷 Running UMAP projection (mode={mode})...")
+
+    # Zero-copy memmap of the binary embedding store (no parsing)
+    index, embeddings = load_embeddings()
+
+    if mode == "full":
+        coords = make_reducer().fit_transform(np.asarray(embeddings, dtype=np.float32))
+
+    elif mode == "sample":
+        coords = np.empty((len(index), 2), dtype=np.float32)
+        todo = np.ones(len(index), dtype=bool)
+
+        if REDUCER_PATH.exists() and not refit:
+            reducer = joblib.load(REDUCER_PATH)
+            print(f"✔ Reusing reducer: {REDUCER_PATH}")
+
+            # Same reducer → coordinates of unchanged articles still hold
+            previous = load_previous(OUTPUT_PATH, ["x", "y"])
+            todo = changed_mask(index, previous).to_numpy()
+            if previous is not None and (~todo).any():
+                reused = index.loc[~todo, ["article_id", HASH_COLUMN]].merge(
+                    previous, on=["article_id", HASH_COLUMN], how="left"
+                )
+                coords[~todo] = reused[["x", "y"]].to_numpy()
+        else:
+            sample = stratified_sample(topic_labels(index["article_id"]), sample_size)
+            print(f"✔ Fitting reducer on {len(sample)} of {len(index)} articles")
+
+            reducer = make_reducer()
+            reducer.fit(np.asarray(embeddings[sample], dtype=np.float32))
+
+            REDUCER_PATH.parent.mkdir(parents=True, exist_ok=True)
+            joblib.dump(reducer, REDUCER_PATH)
+
+            coords[sample] = reducer.embedding_
+            todo[sample] = False
+
+        rows = np.flatnonzero(todo)
+        coords[rows] = transform_in_chunks(reducer, embeddings, rows, chunk_size)
+        print(f"♻️ Placed {len(rows)} articles with transform(), "
+              f"kept {len(index) - len(rows)}")
+
+    else:
+        raise ValueError(f"Unknown UMAP mode: {mode}")
 
     umap_df = pd.DataFrame({
-        "article_id": df["article_id"],
-        "x": umap_embeddings[:, 0],
-        "y": umap_embeddings[:, 1]
+        "article_id": index["article_id"],
+        "x": coords[:, 0],
+        "y": coords[:, 1],
+        HASH_COLUMN: index[HASH_COLUMN],
     })
 
-    umap_df.to_csv("data/processed/umap_embeddings.csv", index=False)
+    umap_df.to_csv(OUTPUT_PATH, index=False)
 
-    print("✅ UMAP projection saved → data/processed/umap_embeddings.csv")
+    print(f"✅ UMAP projection saved → {OUTPUT_PATH}")
 
 if __name__ == "__main__":
     main()
@@ -18,6 +18,8 @@ import pandas as pd
 from pathlib import Path
 import numpy as np
 
+from src.features.dict_encoding import map_unique
+
 # ---------------------------
 # Main pipeline
 # ---------------------------
@@ -51,16 +53,16 @@ def main():
     # --------------------------------------------------
     # Convert anomaly flags to numeric
     # --------------------------------------------------
-    df["linguistic_flag"] = df["is_anomaly"].map(
-        {"Anomaly": 1, "Normal": 0}
+    df["linguistic_flag"] = map_unique(
+        df["is_anomaly"], {"Anomaly": 1, "Normal": 0}.get
     )
 
-    df["location_flag"] = df["location_anomaly"].map(
-        {"Anomaly": 1, "Review": 0.5, "Normal": 0}
+    df["location_flag"] = map_unique(
+        df["location_anomaly"], {"Anomaly": 1, "Review": 0.5, "Normal": 0}.get
     )
 
-    df["temporal_flag"] = df["temporal_anomaly"].map(
-        {"Anomaly": 1, "Normal": 0}
+    df["temporal_flag"] = map_unique(
+        df["temporal_anomaly"], {"Anomaly": 1, "Normal": 0}.get
     )
 
     # --------------------------------------------------
@@ -105,7 +107,7 @@ def main():
         else:
             return "Low"
 
-    brand_risk["risk_level"] = brand_risk["brand_risk_score"].apply(assign_risk_level)
+    brand_risk["risk_level"] = map_unique(brand_risk["brand_risk_score"], assign_risk_level)
 
     brand_risk = brand_risk.sort_values(
         "brand_risk_score",
@@ -9,6 +9,7 @@ Signals Used:
 1️⃣ Linguistic anomaly
 2️⃣ Location anomaly
 3️⃣ Temporal anomaly
+4️⃣ Recycled narrative (near-duplicate cluster)
 
 Final Labels:
 NORMAL    → No anomalies
@@ -24,6 +25,7 @@ from pathlib import Path
 
 # ✅ import location cleaner 
 from src.features.location_cleaning import clean_location
+from src.features.dict_encoding import map_unique, map_unique_frame
 
 
 def main():
@@ -40,9 +42,11 @@ def main():
     # --------------------------------------------------
     # 2️⃣ Clean noisy content locations
     # --------------------------------------------------
-    df[["location_clean", "location_type"]] = (
-        df["content_location"]
-        .apply(lambda x: pd.Series(clean_location(x)))
+    # (evaluated once per distinct location, then broadcast)
+    df[["location_clean", "location_type"]] = map_unique_frame(
+        df["content_location"],
+        clean_location,
+        ["location_clean", "location_type"]
     )
 
     print("✔ Content locations cleaned")
@@ -50,21 +54,29 @@ def main():
     # --------------------------------------------------
     # 3️⃣ Convert anomaly signals to numeric flags
     # --------------------------------------------------
-    df["linguistic_flag"] = df["is_anomaly"].map({
+    df["linguistic_flag"] = map_unique(df["is_anomaly"], {
         "Anomaly": 1,
         "Normal": 0
-    })
+    }.get)
 
-    df["location_flag"] = df["location_anomaly"].map({
+    df["location_flag"] = map_unique(df["location_anomaly"], {
         "Anomaly": 1,
         "Normal": 0,
         "Review": 0   # conservative handling
-    })
+    }.get)
 
-    df["temporal_flag"] = df["temporal_anomaly"].map({
+    df["temporal_flag"] = map_unique(df["temporal_anomaly"], {
         "Anomaly": 1,
         "Normal": 0
-    })
+    }.get)
+
+    if "recycled_anomaly" not in df.columns:   # feature set from before the recycled signal
+        df["recycled_anomaly"] = "Normal"
+
+    df["recycled_flag"] = map_unique(df["recycled_anomaly"], {
+        "Anomaly": 1,
+        "Normal": 0
+    }.get)
 
     # --------------------------------------------------
     # 4️⃣ Total anomaly score
@@ -72,7 +84,8 @@ def main():
     df["total_anomaly_score"] = (
         df["linguistic_flag"] +
         df["location_flag"] +
-        df["temporal_flag"]
+        df["temporal_flag"] +
+        df["recycled_flag"]
     )
 
     # --------------------------------------------------
@@ -86,7 +99,7 @@ def main():
         else:
             return "RED FLAG"
 
-    df["final_label"] = df["total_anomaly_score"].apply(assign_final_label)
+    df["final_label"] = map_unique(df["total_anomaly_score"], assign_final_label)
 
     # --------------------------------------------------
     # 6️⃣ Save final results
@@ -1,56 +1,186 @@
+"""
+Linguistic Anomaly Detection
+----------------------------
+Article-level anomaly labels for anomaly_scores.csv.
+
+Methods:
+- "semantic" (default): kNN density over the sentence embeddings
+  (semantic_anomaly.py)
+- "isolation_forest": IsolationForest on sentiment / topic / length.
+  The fitted forest + sentiment LabelEncoder are saved to
+  models/linguistic_iforest.joblib and reused: a run only scores
+  new / changed articles (content_hash), and refits every
+  REFIT_EVERY_DAYS (or on refit=True).
+
+anomaly_score: higher = more anomalous (> 0 → "Anomaly" for the
+forest, > threshold for the semantic detector).
+"""
+
 import pandas as pd
+import numpy as np
+import joblib
+from pathlib import Path
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import LabelEncoder
 import os
 
-def main():
-    print("🚨 Running linguistic & semantic anomaly detection...")
+from src.features.incremental import HASH_COLUMN, add_content_hash, changed_mask, load_previous
+from src.models import semantic_anomaly
+
+# "semantic": kNN density over the sentence embeddings (semantic_anomaly.py)
+# "isolation_forest": IsolationForest on sentiment / topic / length
+ANOMALY_METHOD = "semantic"
+
+INPUT_PATH = "data/processed/news_final_features.csv"
+OUTPUT_PATH = "data/processed/anomaly_scores.csv"
+MODEL_PATH = Path("models/linguistic_iforest.joblib")
+
+FEATURES = ["sentiment_encoded", "topic_id", "text_length"]
+
+OUTPUT_COLUMNS = ["article_id", HASH_COLUMN, "is_anomaly", "anomaly_score", "model_fitted_at"]
 
-    input_path = "data/processed/news_final_features.csv"
-    output_path = "data/processed/anomaly_scores.csv"
+# Days a fitted forest is reused before the next refit (0 → every run)
+REFIT_EVERY_DAYS = 7
 
-    df = pd.read_csv(input_path)
+# Parallel tree fitting / scoring (-1 → all cores)
+N_JOBS = -1
 
-    # 🔒 Collapse to article level
-    df = (
+
+# -----------------------------
+# Features
+# -----------------------------
+def article_features(df):
+    """
+    Collapse to one row per article.
+    """
+    return (
         df.groupby("article_id", as_index=False)
         .agg(
+            content_hash=(HASH_COLUMN, "first"),
             sentiment_label=("sentiment_label", "first"),
             topic_id=("topic_id", "first"),
             text_length=("text_length", "mean")
         )
     )
 
-    # Encode sentiment
-    le = LabelEncoder()
-    df["sentiment_encoded"] = le.fit_transform(df["sentiment_label"])
 
-    features = df[[
-        "sentiment_encoded",
-        "topic_id",
-        "text_length"
-    ]]
+def encode_sentiment(encoder, labels):
+    """
+    LabelEncoder codes; labels unseen at fit time → -1.
+    """
+    lookup = {label: code for code, label in enumerate(encoder.classes_)}
+    return labels.map(lookup).fillna(-1).astype(int)
+
+
+# -----------------------------
+# Model artifact
+# -----------------------------
+def fit_model(df, n_jobs=N_JOBS, model_path=MODEL_PATH):
+    encoder = LabelEncoder().fit(df["sentiment_label"])
+    features = df.assign(sentiment_encoded=encode_sentiment(encoder, df["sentiment_label"]))
 
     model = IsolationForest(
         n_estimators=200,
         contamination=0.08,
-        random_state=42
+        random_state=42,
+        n_jobs=n_jobs
     )
+    model.fit(features[FEATURES])
+
+    bundle = {
+        "model": model,
+        "encoder": encoder,
+        "fitted_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "articles": len(df),
+    }
+    Path(model_path).parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(bundle, model_path)
+
+    print(f"✔ IsolationForest fitted on {len(df)} articles → {model_path}")
+    return bundle
+
+
+def load_model(model_path=MODEL_PATH):
+    if not Path(model_path).exists():
+        return None
+    return joblib.load(model_path)
+
 
-    df["anomaly_score"] = model.fit_predict(features)
-    df["is_anomaly"] = df["anomaly_score"].apply(
-        lambda x: "Anomaly" if x == -1 else "Normal"
+def needs_refit(bundle, refit_every_days=REFIT_EVERY_DAYS):
+    if bundle is None:
+        return True
+    age = pd.Timestamp.now() - pd.Timestamp(bundle["fitted_at"])
+    return age >= pd.Timedelta(days=refit_every_days)
+
+
+def score(df, bundle, n_jobs=N_JOBS):
+    """
+    Score a batch of articles with a fitted bundle (no refit).
+    Cost grows with len(df), not with the corpus.
+    """
+    model = bundle["model"]
+    model.n_jobs = n_jobs
+
+    features = df.assign(
+        sentiment_encoded=encode_sentiment(bundle["encoder"], df["sentiment_label"])
     )
+    scores = -model.decision_function(features[FEATURES])
+
+    return pd.DataFrame({
+        "article_id": df["article_id"].to_numpy(),
+        HASH_COLUMN: df[HASH_COLUMN].to_numpy(),
+        "is_anomaly": np.where(scores > 0, "Anomaly", "Normal"),
+        "anomaly_score": scores,
+        "model_fitted_at": bundle["fitted_at"],
+    })
+
+
+# -----------------------------
+# Main pipeline
+# -----------------------------
+def main(method=ANOMALY_METHOD, refit=False, refit_every_days=REFIT_EVERY_DAYS, n_jobs=N_JOBS):
+    if method == "semantic":
+        return semantic_anomaly.main(refit=refit)
+    if method != "isolation_forest":
+        raise ValueError(f"Unknown anomaly method: {method}")
+
+    print("🚨 Running linguistic & semantic anomaly detection...")
+
+    df = article_features(add_content_hash(pd.read_csv(INPUT_PATH)))
+
+    bundle = load_model()
+    if refit or needs_refit(bundle, refit_every_days):
+        bundle = fit_model(df, n_jobs)
+    else:
+        print(f"✔ Reusing IsolationForest fitted at {bundle['fitted_at']}")
+
+    # Unchanged articles already scored by this same model keep their labels
+    previous = load_previous(OUTPUT_PATH, OUTPUT_COLUMNS[2:])
+    if previous is not None:
+        previous = previous[previous["model_fitted_at"] == bundle["fitted_at"]]
+    todo = changed_mask(df, previous).to_numpy()
+
+    parts = [pd.DataFrame(columns=OUTPUT_COLUMNS)]
+    if previous is not None and (~todo).any():
+        parts.append(df.loc[~todo, ["article_id", HASH_COLUMN]].merge(
+            previous, on=["article_id", HASH_COLUMN], how="left"
+        ))
+    if todo.any():
+        parts.append(score(df[todo], bundle, n_jobs))
+    scored = df[["article_id"]].merge(
+        pd.concat(parts, ignore_index=True)[OUTPUT_COLUMNS], on="article_id", how="left"
+    )
+
+    print(f"♻️ Scored {int(todo.sum())} articles, kept {int((~todo).sum())}")
 
     # Save minimal output
     os.makedirs("data/processed", exist_ok=True)
-    df[["article_id", "is_anomaly", "anomaly_score"]].to_csv(
-        output_path, index=False
-    )
+    scored.to_csv(OUTPUT_PATH, index=False)
 
     print("✅ Linguistic anomaly detection completed")
-    print(df["is_anomaly"].value_counts())
-    print(f"Total rows: {len(df)}")
+    print(scored["is_anomaly"].value_counts())
+    print(f"Total rows: {len(scored)}")
+    return scored
 
 if __name__ == "__main__":
     main()
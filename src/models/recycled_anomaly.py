@@ -0,0 +1,40 @@
+"""
+Recycled Narrative Detection
+----------------------------
+Flags articles that belong to a cluster of near-duplicate
+stories (same text recycled / lightly edited across outlets),
+using the clusters from near_duplicates.py.
+"""
+
+import pandas as pd
+import numpy as np
+from pathlib import Path
+
+# An article is "recycled" when at least this many articles
+# (itself included) share its near-duplicate cluster
+RECYCLED_MIN_CLUSTER_SIZE = 3
+
+
+def main(min_cluster_size=RECYCLED_MIN_CLUSTER_SIZE):
+    print("♻️ Running recycled narrative detection...")
+
+    # 1️⃣ Load near-duplicate clusters
+    df = pd.read_csv("data/processed/near_duplicates.csv")
+
+    # 2️⃣ Recycled anomaly flag
+    df["recycled_anomaly"] = np.where(
+        df["dup_cluster_size"] >= min_cluster_size,
+        "Anomaly",
+        "Normal"
+    )
+
+    # 3️⃣ Save
+    output_path = Path("data/processed/news_with_recycled_anomaly.csv")
+    df.to_csv(output_path, index=False)
+
+    print("✅ Recycled narrative detection completed")
+    print(df["recycled_anomaly"].value_counts())
+
+
+if __name__ == "__main__":
+    main()
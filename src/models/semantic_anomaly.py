@@ -0,0 +1,201 @@
+"""
+Semantic Anomaly Detection
+--------------------------
+Flags articles whose content sits in a sparse region of the
+embedding space, using k-nearest-neighbour density from the
+ANN index (src/features/ann_index.py) — no pairwise distances,
+so cost grows ~ n log n instead of n².
+
+Score (LOF-style):
+    knn_distance(a)  = mean cosine distance to its k neighbours
+    anomaly_score(a) = knn_distance(a) / mean knn_distance of
+                       those neighbours
+≈ 1 inside a cluster, well above 1 for isolated articles. The
+ratio adapts to dense vs naturally spread-out topics.
+
+Fitted state (persisted, reused by score()):
+models/semantic_anomaly/state.json       k, threshold, ...
+models/semantic_anomaly/reference.csv    article_id, knn_distance
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from src.features import ann_index
+from src.features.ann_index import ArticleIndex
+from src.features.embedding_store import load_embeddings
+
+STATE_DIR = Path("models/semantic_anomaly")
+
+K = 10
+
+# Share of the fitted corpus labelled "Anomaly"
+CONTAMINATION = 0.08
+
+# Articles per ANN query batch
+QUERY_BATCH = 10_000
+
+
+def state_path(state_dir=STATE_DIR):
+    return Path(state_dir) / "state.json"
+
+
+def reference_path(state_dir=STATE_DIR):
+    return Path(state_dir) / "reference.csv"
+
+
+def load_ann():
+    """
+    ANN index brought up to date with the embedding store first
+    (incremental: only new / changed / removed articles are touched).
+    """
+    ann_index.main()
+    return ArticleIndex.load()
+
+
+# -----------------------------
+# Neighbourhoods
+# -----------------------------
+def neighbour_distances(ann, article_ids, vectors, k=K):
+    """
+    (labels, distances) of the k nearest OTHER articles, in batches.
+    article_ids may contain ids not in the index (new articles).
+    k is capped at live articles - 1, so one query column is left
+    for the article itself.
+    """
+    k = min(k, len(ann) - 1)
+    if k < 1:
+        raise ValueError(
+            f"Semantic anomaly detection needs at least 2 indexed articles, got {len(ann)}"
+        )
+
+    article_ids = np.asarray(article_ids, dtype=np.int64)
+    labels = np.empty((len(article_ids), k), dtype=np.int64)
+    distances = np.empty((len(article_ids), k), dtype=np.float32)
+
+    for start in range(0, len(article_ids), QUERY_BATCH):
+        stop = start + QUERY_BATCH
+        found, dist = ann.query(np.asarray(vectors[start:stop], dtype=np.float32), k=k + 1)
+
+        for i, (row_labels, row_dist) in enumerate(zip(found, dist)):
+            keep = row_labels != article_ids[start + i]
+            labels[start + i] = row_labels[keep][:k]
+            distances[start + i] = row_dist[keep][:k]
+
+    return labels, distances
+
+
+def density_scores(labels, distances, reference):
+    """
+    knn_distance and LOF-style ratio against the neighbours'
+    reference knn distances.
+    """
+    knn_distance = distances.mean(axis=1)
+
+    lookup = reference.set_index("article_id")["knn_distance"]
+    neighbour_knn = (
+        pd.Series(labels.ravel()).map(lookup)
+        .fillna(lookup.median())        # neighbours added after the fit
+        .to_numpy().reshape(labels.shape)
+    )
+    ratio = knn_distance / np.maximum(neighbour_knn.mean(axis=1), 1e-9)
+    return knn_distance, ratio
+
+
+# -----------------------------
+# Fit / score
+# -----------------------------
+def fit(k=K, contamination=CONTAMINATION, state_dir=STATE_DIR):
+    """
+    Score the whole stored corpus, fix the anomaly threshold and
+    persist the state. Returns the scores of every article.
+    """
+    index, embeddings = load_embeddings()
+    ann = load_ann()
+    article_ids = index["article_id"].to_numpy()
+
+    labels, distances = neighbour_distances(ann, article_ids, embeddings, k)
+    reference = pd.DataFrame({
+        "article_id": article_ids,
+        "knn_distance": distances.mean(axis=1),
+    })
+    knn_distance, scores = density_scores(labels, distances, reference)
+    threshold = float(np.quantile(scores, 1 - contamination))
+
+    state_dir = Path(state_dir)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    reference.to_csv(reference_path(state_dir), index=False)
+    with open(state_path(state_dir), "w") as f:
+        json.dump({
+            "fitted_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+            "k": k,
+            "contamination": contamination,
+            "threshold": threshold,
+            "reference_articles": len(reference),
+        }, f, indent=2)
+
+    print(f"✔ Semantic anomaly model fitted on {len(reference)} articles "
+          f"(threshold={threshold:.3f})")
+    return score_frame(article_ids, knn_distance, scores, threshold)
+
+
+def score(article_ids, vectors, state_dir=STATE_DIR, ann=None):
+    """
+    Score a batch of articles with the persisted state (no refit).
+    """
+    with open(state_path(state_dir)) as f:
+        state = json.load(f)
+    reference = pd.read_csv(reference_path(state_dir))
+    if ann is None:
+        ann = load_ann()
+
+    labels, distances = neighbour_distances(ann, article_ids, vectors, state["k"])
+
+    # Articles scored now (new / changed since the fit) are their own
+    # up-to-date reference
+    current = pd.DataFrame({
+        "article_id": np.asarray(article_ids),
+        "knn_distance": distances.mean(axis=1),
+    })
+    reference = pd.concat([
+        reference[~reference["article_id"].isin(current["article_id"])],
+        current,
+    ])
+
+    knn_distance, scores = density_scores(labels, distances, reference)
+    return score_frame(article_ids, knn_distance, scores, state["threshold"])
+
+
+def score_frame(article_ids, knn_distance, scores, threshold):
+    return pd.DataFrame({
+        "article_id": np.asarray(article_ids),
+        "knn_distance": knn_distance,
+        "anomaly_score": scores,
+        "is_anomaly": np.where(scores > threshold, "Anomaly", "Normal"),
+    })
+
+
+def is_fitted(state_dir=STATE_DIR):
+    return state_path(state_dir).exists() and reference_path(state_dir).exists()
+
+
+def main(refit=False, output_path="data/processed/anomaly_scores.csv"):
+    print("🚨 Running semantic (embedding density) anomaly detection...")
+
+    if refit or not is_fitted():
+        result = fit()
+    else:
+        index, embeddings = load_embeddings()
+        result = score(index["article_id"], embeddings)
+
+    result.to_csv(output_path, index=False)
+
+    print("✅ Semantic anomaly detection completed")
+    print(result["is_anomaly"].value_counts())
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,54 @@ Temporal Anomaly Detection
 --------------------------
 Detects sudden spikes in news volume over time
 using rolling statistics (mean + std).
+
+Modes:
+- "online" (default): a RollingWindow per series (ring buffer of
+  the last WINDOW daily counts + running sums) is kept on disk and
+  updated in O(1) per new day / article batch
+- "batch": rolling mean / std over the whole daily history
+
+Both give the same decisions (src/evaluation/temporal_parity.py).
+The window runs over days that have articles, like
+rolling(7, min_periods=3) on the daily counts.
 """
 
+import json
 import pandas as pd
 import numpy as np
+from collections import deque
 from pathlib import Path
 
+TEMPORAL_MODE = "online"
 
-def main():
-    print("⏳ Running temporal anomaly detection...")
+INPUT_PATH = Path("data/processed/news_with_temporal_features.csv")
+OUTPUT_PATH = Path("data/processed/news_with_temporal_anomaly.csv")
 
-    # 1️⃣ Load data
-    df = pd.read_csv("data/processed/news_with_temporal_features.csv")
-    df["Date"] = pd.to_datetime(df["Date"])
+# Per-day decisions (one row per date, last row updated in place)
+DAILY_PATH = Path("data/processed/temporal_daily.csv")
+STATE_PATH = Path("models/temporal_state.json")
+
+WINDOW = 7
+MIN_PERIODS = 3
+Z_THRESHOLD = 1.8
 
-    # 2️⃣ Aggregate article count per day
+# Single volume series (all articles); state is keyed by series name
+SERIES = "all"
+
+DAILY_COLUMNS = [
+    "Date", "article_count", "rolling_mean", "rolling_std",
+    "z_score", "temporal_anomaly"
+]
+
+
+# -----------------------------
+# Batch
+# -----------------------------
+def batch_daily(df):
+    """
+    Daily counts + rolling statistics over the full history.
+    """
+    # Aggregate article count per day
     daily_counts = (
         df.groupby("Date")
           .size()
@@ -25,42 +58,209 @@ def main():
           .sort_values("Date")
     )
 
-    # 3️⃣ Rolling statistics (7-day window)
+    # Rolling statistics (7-day window)
     daily_counts["rolling_mean"] = (
         daily_counts["article_count"]
-        .rolling(window=7, min_periods=3)
+        .rolling(window=WINDOW, min_periods=MIN_PERIODS)
         .mean()
     )
 
     daily_counts["rolling_std"] = (
         daily_counts["article_count"]
-        .rolling(window=7, min_periods=3)
+        .rolling(window=WINDOW, min_periods=MIN_PERIODS)
         .std()
     )
 
-    # 4️⃣ Z-score calculation
+    # Z-score calculation
     daily_counts["z_score"] = (
         (daily_counts["article_count"] - daily_counts["rolling_mean"]) /
         daily_counts["rolling_std"]
     )
 
-    # 5️⃣ Temporal anomaly flag
+    # Temporal anomaly flag
     daily_counts["temporal_anomaly"] = np.where(
-        daily_counts["z_score"] > 1.8,
+        daily_counts["z_score"] > Z_THRESHOLD,
         "Anomaly",
         "Normal"
     )
+    return daily_counts
+
+
+# -----------------------------
+# Online
+# -----------------------------
+class RollingWindow:
+    """
+    Last `window` daily counts of one series, with running sum and
+    sum of squares (integers → exact mean / sample std).
+    """
+
+    def __init__(self, window=WINDOW, counts=(), last_date=None):
+        self.counts = deque((int(c) for c in counts), maxlen=window)
+        self.total = sum(self.counts)
+        self.total_sq = sum(c * c for c in self.counts)
+        self.last_date = last_date
+
+    def push(self, count):
+        if len(self.counts) == self.counts.maxlen:
+            old = self.counts[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.counts.append(count)
+        self.total += count
+        self.total_sq += count * count
+
+    def add_to_last(self, count):
+        last = self.counts[-1]
+        self.counts[-1] = last + count
+        self.total += count
+        self.total_sq += (last + count) ** 2 - last * last
+
+    def update(self, date, count):
+        """
+        Add `count` articles dated `date` (a new day, or more
+        articles for the latest day) and return that day's row.
+        """
+        count = int(count)
+        if self.last_date is None or date > self.last_date:
+            self.push(count)
+            self.last_date = date
+        elif date == self.last_date:
+            self.add_to_last(count)
+        else:
+            raise ValueError(f"{date} is before the latest day {self.last_date}")
+        return self.stats()
+
+    def stats(self):
+        n = len(self.counts)
+        today = self.counts[-1]
+        mean = std = z = np.nan
+
+        if n >= MIN_PERIODS:
+            mean = self.total / n
+            std = np.sqrt(max(self.total_sq - self.total ** 2 / n, 0) / (n - 1))
+            if std > 0:
+                z = (today - mean) / std
+
+        return {
+            "Date": self.last_date,
+            "article_count": today,
+            "rolling_mean": mean,
+            "rolling_std": std,
+            "z_score": z,
+            "temporal_anomaly": "Anomaly" if z > Z_THRESHOLD else "Normal",
+        }
+
+    def to_dict(self):
+        return {
+            "window": self.counts.maxlen,
+            "counts": list(self.counts),
+            "last_date": self.last_date.isoformat() if self.last_date is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        last_date = pd.Timestamp(state["last_date"]) if state["last_date"] else None
+        return cls(state["window"], state["counts"], last_date)
+
+
+def load_state(path=STATE_PATH):
+    if not Path(path).exists():
+        return {}
+    with open(path) as f:
+        return {name: RollingWindow.from_dict(s) for name, s in json.load(f).items()}
+
+
+def save_state(windows, path=STATE_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({name: w.to_dict() for name, w in windows.items()}, f, indent=2)
+
+
+def online_daily(new_articles, window, daily=None):
+    """
+    Feed new articles into the window day by day; returns the daily
+    table with the affected days added / replaced.
+    """
+    counts = new_articles.groupby("Date").size().sort_index()
+    rows = [window.update(date, count) for date, count in counts.items()]
+    if not rows and daily is not None:
+        return daily
+
+    updated = pd.DataFrame(rows, columns=DAILY_COLUMNS).drop_duplicates("Date", keep="last")
+    if daily is None or daily.empty:
+        return updated
+    daily = daily[~daily["Date"].isin(updated["Date"])]
+    return pd.concat([daily, updated], ignore_index=True)
+
+
+def run_online(df, rebuild=False):
+    """
+    Only articles not in the previous output are counted; the stored
+    window is rebuilt from the full history when state is missing or
+    new articles arrive for days before the latest one.
+    """
+    windows = {} if rebuild else load_state()
+    window = windows.get(SERIES)
+
+    daily = None
+    new_articles = df
+    if window is not None and DAILY_PATH.exists() and OUTPUT_PATH.exists():
+        seen = pd.read_csv(OUTPUT_PATH, usecols=["article_id"])["article_id"]
+        new_articles = df[~df["article_id"].isin(seen)]
+
+        if (new_articles["Date"] < window.last_date).any():
+            print("↻ Articles for past days → rebuilding temporal state")
+            window, new_articles = None, df
+        else:
+            daily = pd.read_csv(DAILY_PATH, parse_dates=["Date"])
+    else:
+        window = None
+
+    if window is None:
+        window = RollingWindow()
+        new_articles = df
+
+    daily = online_daily(new_articles.dropna(subset=["Date"]), window, daily)
+    windows[SERIES] = window
+    save_state(windows)
+
+    print(f"♻️ Online update: {len(new_articles)} new articles, "
+          f"{len(df) - len(new_articles)} already counted")
+    return daily
+
+
+# -----------------------------
+# Main pipeline
+# -----------------------------
+def main(mode=TEMPORAL_MODE, rebuild=False):
+    print("⏳ Running temporal anomaly detection...")
+
+    # 1️⃣ Load data
+    df = pd.read_csv(INPUT_PATH)
+    df["Date"] = pd.to_datetime(df["Date"])
+
+    # 2️⃣ Daily counts, rolling statistics, anomaly flag
+    if mode == "online":
+        daily_counts = run_online(df, rebuild)
+    elif mode == "batch":
+        daily_counts = batch_daily(df)
+    else:
+        raise ValueError(f"Unknown temporal mode: {mode}")
+
+    DAILY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    daily_counts[DAILY_COLUMNS].to_csv(DAILY_PATH, index=False)
 
-    # 6️⃣ Merge back to original data
+    # 3️⃣ Merge back to original data
     df = df.merge(
         daily_counts[["Date", "temporal_anomaly"]],
         on="Date",
         how="left"
     )
 
-    # 7️⃣ Save output
-    output_path = Path("data/processed/news_with_temporal_anomaly.csv")
-    df.to_csv(output_path, index=False)
+    # 4️⃣ Save output
+    df.to_csv(OUTPUT_PATH, index=False)
 
     print("✅ Temporal anomaly detection completed")
     print(df["temporal_anomaly"].value_counts())